@@ -0,0 +1,94 @@
+"""
+Timer traces write one json line per directory build to a rotating file in addon_data
+Module has no Kodi imports at top level so that traces can be aggregated offline:
+    python timertrace.py timer_trace.jsonl [timer_trace.1.jsonl ...]
+"""
+import json
+import os
+
+
+TIMER_TRACE_FOLDER = 'log_trace'
+TIMER_TRACE_FILENAME = 'timer_trace'
+TIMER_TRACE_MAXSIZE = 1024 * 1024  # Rotate file once it reaches 1MB
+TIMER_TRACE_BACKUPS = 4
+
+
+def get_timer_trace_folder():
+    from xbmcvfs import translatePath
+    from tmdbhelper.lib.files.futils import get_write_path
+    return translatePath(get_write_path(TIMER_TRACE_FOLDER, True))
+
+
+def get_timer_trace_files(folder):
+    """ Returns trace files in folder from newest to oldest """
+    files = [f'{TIMER_TRACE_FILENAME}.jsonl'] + [f'{TIMER_TRACE_FILENAME}.{x}.jsonl' for x in range(1, TIMER_TRACE_BACKUPS + 1)]
+    return [os.path.join(folder, i) for i in files]
+
+
+def rotate_timer_trace_files(files):
+    """ Shift each file along one place dropping the oldest """
+    for x in range(len(files) - 1, 0, -1):
+        if os.path.exists(files[x - 1]):
+            os.replace(files[x - 1], files[x])
+
+
+def write_timer_trace(timer_lists, paramstring, **kwargs):
+    """ Append totals of timer lists with any additional kwargs as one json line to trace file """
+    from time import time
+    trace = {
+        'timestamp': int(time()),
+        'paramstring': paramstring,
+        'timers': {k: round(sum(v), 4) for k, v in timer_lists.items() if v and '.' not in k}}  # Skip per item timers
+    trace.update(kwargs)
+    try:
+        files = get_timer_trace_files(get_timer_trace_folder())
+        if os.path.exists(files[0]) and os.path.getsize(files[0]) >= TIMER_TRACE_MAXSIZE:
+            rotate_timer_trace_files(files)
+        with open(files[0], 'a', encoding='utf-8') as f:
+            f.write(f'{json.dumps(trace, separators=(",", ":"))}\n')
+    except OSError:
+        return
+
+
+def read_timer_traces(files):
+    traces = []
+    for file in files:
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                traces += [json.loads(i) for i in f if i.strip()]
+        except (OSError, ValueError):
+            continue
+    return traces
+
+
+def get_percentile(values, percentile):
+    """ Nearest rank percentile of values """
+    if not values:
+        return 0
+    values = sorted(values)
+    rank = max(int(-(-percentile * len(values) // 100)), 1)  # Ceiling division
+    return values[rank - 1]
+
+
+def get_timer_trace_report(traces, bucket='total'):
+    """ Returns table of count, p50 and p95 for timer bucket grouped by route sorted by slowest p95 """
+    routes = {}
+    for i in traces:
+        value = (i.get('timers') or {}).get(bucket)
+        if value is None:
+            continue
+        routes.setdefault(i.get('route') or 'none', []).append(value)
+    if not routes:
+        return ''
+    rows = sorted(
+        ((k, len(v), get_percentile(v, 50), get_percentile(v, 95)) for k, v in routes.items()),
+        key=lambda row: row[3], reverse=True)
+    width = max(len(i[0]) for i in rows)
+    lines = [f'{"ROUTE":<{width}} {"COUNT":>7} {"P50":>8} {"P95":>8}']
+    lines += [f'{k:<{width}} {n:>7} {p50:>8.3f} {p95:>8.3f}' for k, n, p50, p95 in rows]
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import sys
+    print(get_timer_trace_report(read_timer_traces(sys.argv[1:])))
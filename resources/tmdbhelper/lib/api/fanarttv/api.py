@@ -79,7 +79,21 @@ class FanartTV(RequestAPI):
         """
         ftv_type can be 'movies' 'tv'
         ftv_id is tmdb_id|imdb_id for movies and tvdb_id for tv
+        Resolved artwork is cached separately from raw response so that items only load the final art dict
+        Raw response is only used for artlist_type requests or when resolved artwork isn't cached
         """
+        if not ftv_type or not ftv_id:
+            return {}
+        if artlist_type:
+            return self.get_resolved_artwork(ftv_id, ftv_type, season=season, artlist_type=artlist_type, season_type=season_type)
+        return self._cache.use_cache(
+            self.get_resolved_artwork, ftv_id=ftv_id, ftv_type=ftv_type, season=season, season_type=season_type,
+            cache_name=f'FanartTV.get_all_artwork.v1.{ftv_type}.{ftv_id}.{season}.{season_type}.{self.language}.{EN_FALLBACK}',
+            cache_days=CACHE_EXTENDED,
+            cache_refresh=self.cache_refresh) or {}
+
+    def get_resolved_artwork(self, ftv_id, ftv_type, season=None, artlist_type=None, season_type=None):
+        """ Select best artwork for each type from raw response using language fallbacks and season filtering """
         def get_artwork_type(key, get_lang=True):
             if not key:
                 return
@@ -1,4 +1,4 @@
-from jurialmunkey.parser import try_int, find_dict_in_list
+from jurialmunkey.parser import try_int
 from tmdbhelper.lib.addon.thread import use_thread_lock
 import jurialmunkey.jsnrpc as jurialmunkey_jsnrpc
 
@@ -37,6 +37,65 @@ def get_person_stats(person):
     return infoproperties
 
 
+ITEM_DETAILS = {
+    'movie': {
+        'method': "VideoLibrary.GetMovieDetails",
+        'properties': [
+            "title", "genre", "year", "rating", "director", "trailer", "tagline", "plot", "plotoutline", "originaltitle",
+            "lastplayed", "playcount", "writer", "studio", "mpaa", "cast", "country", "imdbnumber", "runtime", "set",
+            "showlink", "streamdetails", "top250", "votes", "fanart", "thumbnail", "file", "sorttitle", "resume", "setid",
+            "dateadded", "tag", "art", "userrating", "ratings", "premiered", "uniqueid"]},
+    'tvshow': {
+        'method': "VideoLibrary.GetTVShowDetails",
+        'properties': [
+            "title", "genre", "year", "rating", "plot", "studio", "mpaa", "cast", "playcount", "episode", "imdbnumber",
+            "premiered", "votes", "lastplayed", "fanart", "thumbnail", "file", "originaltitle", "sorttitle", "episodeguide",
+            "season", "watchedepisodes", "dateadded", "tag", "art", "userrating", "ratings", "runtime", "uniqueid"]},
+    'season': {
+        'method': "VideoLibrary.GetSeasonDetails",
+        'properties': [
+            "season", "showtitle", "playcount", "episode", "fanart", "thumbnail", "tvshowid", "watchedepisodes",
+            "art", "userrating", "title"]},
+    'episode': {
+        'method': "VideoLibrary.GetEpisodeDetails",
+        'properties': [
+            "title", "plot", "votes", "rating", "writer", "firstaired", "playcount", "runtime", "director", "productioncode",
+            "season", "episode", "originaltitle", "showtitle", "cast", "streamdetails", "lastplayed", "fanart", "thumbnail",
+            "file", "resume", "tvshowid", "dateadded", "uniqueid", "art", "specialsortseason", "specialsortepisode", "userrating",
+            "seasonid", "ratings"]},
+}
+
+
+def get_jsonrpc_batch(queries):
+    """ Send list of (method, params) in a single batched JSON-RPC request. Returns list of responses in same order """
+    if not queries:
+        return []
+    import json
+    from xbmc import executeJSONRPC
+    request = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": x}
+        for x, (method, params) in enumerate(queries)]
+    try:
+        response = json.loads(executeJSONRPC(json.dumps(request)))
+    except Exception as exc:
+        from tmdbhelper.lib.addon.logger import kodi_log
+        kodi_log(f'TMDbHelper - JSONRPC Batch Error:\n{exc}', 1)
+        return [{} for _ in queries]
+    if not isinstance(response, list):
+        return [{} for _ in queries]
+    responses = {i.get('id'): i for i in response if isinstance(i, dict)}  # Match by id as batch responses can be unordered
+    return [responses.get(x) or {} for x in range(len(queries))]
+
+
+def map_item_details(details=None, dbid=None, key=None):
+    if not details or not dbid or not key:
+        return {}
+    details = dict(details)  # Copy so that cached raw details can be mapped again
+    details['dbid'] = dbid
+    from tmdbhelper.lib.api.kodi.mapping import ItemMapper
+    return ItemMapper(key=key).get_info(details)
+
+
 def get_item_details(dbid=None, method=None, key=None, properties=None):
     if not dbid or not method or not key or not properties:
         return {}
@@ -46,55 +105,75 @@ def get_item_details(dbid=None, method=None, key=None, properties=None):
     try:
         details = get_jsonrpc(method, params)
         details = details['result'][f'{key}details']
-        details['dbid'] = dbid
-        from tmdbhelper.lib.api.kodi.mapping import ItemMapper
-        return ItemMapper(key=key).get_info(details)
+        return map_item_details(details, dbid, key)
     except (AttributeError, KeyError):
         return {}
 
 
+def get_item_details_batch(items):
+    """ Get raw details for list of (key, dbid) tuples in a single JSON-RPC request
+    Returns dictionary of {(key, dbid): details} to be mapped using map_item_details
+    """
+    queries, keys = [], []
+    for key, dbid in dict.fromkeys(items):
+        if not dbid or key not in ITEM_DETAILS:
+            continue
+        params = {f'{key}id': try_int(dbid), "properties": ITEM_DETAILS[key]['properties']}
+        queries.append((ITEM_DETAILS[key]['method'], params))
+        keys.append((key, dbid))
+    details = {}
+    for (key, dbid), response in zip(keys, get_jsonrpc_batch(queries)):
+        try:
+            details[(key, dbid)] = response['result'][f'{key}details']
+        except (AttributeError, KeyError, TypeError):
+            continue
+    return details
+
+
 def get_movie_details(dbid=None):
-    properties = [
-        "title", "genre", "year", "rating", "director", "trailer", "tagline", "plot", "plotoutline", "originaltitle",
-        "lastplayed", "playcount", "writer", "studio", "mpaa", "cast", "country", "imdbnumber", "runtime", "set",
-        "showlink", "streamdetails", "top250", "votes", "fanart", "thumbnail", "file", "sorttitle", "resume", "setid",
-        "dateadded", "tag", "art", "userrating", "ratings", "premiered", "uniqueid"]
-    return get_item_details(dbid=dbid, method="VideoLibrary.GetMovieDetails", key="movie", properties=properties)
+    return get_item_details(dbid=dbid, key="movie", **ITEM_DETAILS['movie'])
 
 
 def get_tvshow_details(dbid=None):
-    properties = [
-        "title", "genre", "year", "rating", "plot", "studio", "mpaa", "cast", "playcount", "episode", "imdbnumber",
-        "premiered", "votes", "lastplayed", "fanart", "thumbnail", "file", "originaltitle", "sorttitle", "episodeguide",
-        "season", "watchedepisodes", "dateadded", "tag", "art", "userrating", "ratings", "runtime", "uniqueid"]
-    return get_item_details(dbid=dbid, method="VideoLibrary.GetTVShowDetails", key="tvshow", properties=properties)
+    return get_item_details(dbid=dbid, key="tvshow", **ITEM_DETAILS['tvshow'])
 
 
 def get_season_details(dbid=None):
-    properties = [
-        "season", "showtitle", "playcount", "episode", "fanart", "thumbnail", "tvshowid", "watchedepisodes",
-        "art", "userrating", "title"]
-    return get_item_details(dbid=dbid, method="VideoLibrary.GetSeasonDetails", key="season", properties=properties)
+    return get_item_details(dbid=dbid, key="season", **ITEM_DETAILS['season'])
 
 
 def get_episode_details(dbid=None):
-    properties = [
-        "title", "plot", "votes", "rating", "writer", "firstaired", "playcount", "runtime", "director", "productioncode",
-        "season", "episode", "originaltitle", "showtitle", "cast", "streamdetails", "lastplayed", "fanart", "thumbnail",
-        "file", "resume", "tvshowid", "dateadded", "uniqueid", "art", "specialsortseason", "specialsortepisode", "userrating",
-        "seasonid", "ratings"]
-    return get_item_details(dbid=dbid, method="VideoLibrary.GetEpisodeDetails", key="episode", properties=properties)
+    return get_item_details(dbid=dbid, key="episode", **ITEM_DETAILS['episode'])
 
 
 THREAD_LOCK = 'TMDbHelper.KodiLibrary.ThreadLock'
+INDEX_KEYS = ('dbid', 'season', 'imdb_id', 'tmdb_id', 'tvdb_id', 'originaltitle', 'title')
+INFO_CACHE_MAX = 512  # Maximum number of get_info results memoised per KodiLibrary object
 
 
 class KodiLibrary(object):
     def __init__(self, dbtype=None, tvshowid=None, logging=True, cache_refresh=False):
+        from collections import OrderedDict
+        from threading import Lock
         self._dbtype = dbtype
         self._tvshowid = tvshowid
         self._logging = logging
         self._cache_refresh = cache_refresh
+        self._info_cache = OrderedDict()  # Process local LRU of get_info results in front of MemoryCache
+        self._info_cache_lock = Lock()
+
+    @property
+    def cache_refresh(self):
+        return self._cache_refresh
+
+    @cache_refresh.setter
+    def cache_refresh(self, value):
+        """ Clear memoised results when refreshing so that lookups go back to the library """
+        self._cache_refresh = value
+        if not value:
+            return
+        with self._info_cache_lock:
+            self._info_cache.clear()
 
     @property
     def cache(self):
@@ -113,6 +192,43 @@ class KodiLibrary(object):
             self._database = self._get_cached_database()
             return self._database
 
+    @property
+    def database_index(self):
+        try:
+            return self._database_index
+        except AttributeError:
+            self._database_index = self._get_database_index(self.database)
+            return self._database_index
+
+    @staticmethod
+    def _get_title_year_key(title, year):
+        """ Normalised (title, year) key so that title matches ignore case and whitespace differences """
+        return (' '.join(f'{title}'.casefold().split()), try_int(year))
+
+    def _get_database_index(self, database):
+        """ Map each INDEX_KEYS value to list of positions in database so lookups don't need to scan list
+        Titles are also indexed by normalised (title, year) key for both title and originaltitle
+        """
+        database_index = {k: {} for k in INDEX_KEYS}
+        database_index['title_year'] = {}
+        for x, item in enumerate(database or []):
+            for k in INDEX_KEYS:
+                v = item.get(k)
+                if v is None:
+                    continue
+                database_index[k].setdefault(v, []).append(x)
+            for k in {item.get('originaltitle'), item.get('title')}:
+                if not k:
+                    continue
+                database_index['title_year'].setdefault(self._get_title_year_key(k, item.get('year')), []).append(x)
+        return database_index
+
+    def _find_index(self, key, value):
+        try:
+            return self.database_index[key].get(value) or []
+        except TypeError:  # Unhashable value can't match anything in the database
+            return []
+
     @use_thread_lock(THREAD_LOCK)
     def _get_cached_database(self):
 
@@ -204,22 +320,28 @@ class KodiLibrary(object):
             return
 
         yearcheck = False
-        index_list = find_dict_in_list(self.database, 'dbid', dbid) if dbid else []
+        index_list = self._find_index('dbid', dbid) if dbid else []
 
         if not index_list and season:
-            index_list = find_dict_in_list(self.database, 'season', try_int(season))
+            index_list = self._find_index('season', try_int(season))
         if not index_list and imdb_id:
-            index_list = find_dict_in_list(self.database, 'imdb_id', imdb_id)
+            index_list = self._find_index('imdb_id', imdb_id)
         if not index_list and tmdb_id:
-            index_list = find_dict_in_list(self.database, 'tmdb_id', str(tmdb_id))
+            index_list = self._find_index('tmdb_id', str(tmdb_id))
         if not index_list and tvdb_id:
-            index_list = find_dict_in_list(self.database, 'tvdb_id', str(tvdb_id))
+            index_list = self._find_index('tvdb_id', str(tvdb_id))
+        if not index_list and not episode:
+            # Also use year if matching by title to be certain we have correct item
+            for i in (originaltitle, title):
+                title_year_list = self._find_index('title_year', self._get_title_year_key(i, year)) if i else None
+                if title_year_list:
+                    return self.database[title_year_list[0]].get(info)
         if not index_list:
-            yearcheck = str(year) or 'dummynull'  # Also use year if matching by title to be certain we have correct item. Dummy value for True value that will always fail comparison check.
+            yearcheck = str(year) or 'dummynull'  # Dummy value for True value that will always fail comparison check.
         if not index_list and originaltitle:
-            index_list = find_dict_in_list(self.database, 'originaltitle', originaltitle)
+            index_list = self._find_index('originaltitle', originaltitle)
         if not index_list and title:
-            index_list = find_dict_in_list(self.database, 'title', title)
+            index_list = self._find_index('title', title)
 
         for i in index_list:
             if season and episode:
@@ -236,6 +358,42 @@ class KodiLibrary(object):
     def get_info(
         self, info, dbid=None, imdb_id=None, originaltitle=None, title=None, year=None,
         season=None, episode=None, fuzzy_match=False, tmdb_id=None, tvdb_id=None
+    ):
+        key = (info, dbid, imdb_id, originaltitle, title, year, season, episode, fuzzy_match, tmdb_id, tvdb_id)
+
+        try:
+            with self._info_cache_lock:
+                self._info_cache.move_to_end(key)
+                return self._info_cache[key]
+        except (KeyError, TypeError):
+            pass
+
+        result = self._get_cached_info(
+            info,
+            dbid=dbid,
+            imdb_id=imdb_id,
+            originaltitle=originaltitle,
+            title=title,
+            year=year,
+            season=season,
+            episode=episode,
+            fuzzy_match=fuzzy_match,
+            tmdb_id=tmdb_id,
+            tvdb_id=tvdb_id)
+
+        try:
+            with self._info_cache_lock:
+                self._info_cache[key] = result
+                if len(self._info_cache) > INFO_CACHE_MAX:
+                    self._info_cache.popitem(last=False)
+        except TypeError:  # Unhashable lookup value so don't memoise
+            pass
+
+        return result
+
+    def _get_cached_info(
+        self, info, dbid=None, imdb_id=None, originaltitle=None, title=None, year=None,
+        season=None, episode=None, fuzzy_match=False, tmdb_id=None, tvdb_id=None
     ):
         return self.cache.use(
             self._get_info, info,
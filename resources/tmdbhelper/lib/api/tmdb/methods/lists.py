@@ -231,28 +231,29 @@ def get_cast_list(
     return self.get_paginated_items(items, limit, page)
 
 
-def get_downloaded_list(export_list, sorting=None, reverse=False, datestamp=None):
-    from tmdbhelper.lib.files.downloader import Downloader
-    if not export_list or not datestamp:
-        return
-    from json import loads as json_loads
-    download_url = f'https://files.tmdb.org/p/exports/{export_list}_ids_{datestamp}.json.gz'
-    raw_list = [json_loads(i) for i in Downloader(download_url=download_url).get_gzip_text().splitlines()]
-    return sorted(raw_list, key=lambda k: k.get(sorting, ''), reverse=reverse) if sorting else raw_list
-
-
 def get_daily_list(export_list, sorting=None, reverse=False):
+    """ Returns DailyExportList sequence of TMDb daily export which reads requested slices from on disk store """
     if not export_list:
         return
     from tmdbhelper.lib.addon.tmdate import get_datetime_now, get_timedelta
-    from tmdbhelper.lib.files.futils import use_json_filecache
+    from tmdbhelper.lib.files.edcache import DailyExportCache, DailyExportList
     datestamp = get_datetime_now() - get_timedelta(days=2)
     datestamp = datestamp.strftime("%m_%d_%Y")
-    # Pickle results rather than cache due to being such a large list
-    return use_json_filecache(
-        get_downloaded_list,
-        export_list=export_list, sorting=sorting, reverse=reverse, datestamp=datestamp,
-        cache_name=f'TMDb.Downloaded.List.v3.{export_list}.{sorting}.{reverse}')
+    edc = DailyExportCache()
+    export = edc.get_export(export_list)
+    if not export or export[0] != datestamp:
+        from tmdbhelper.lib.addon.dialog import BusyDialog
+        with BusyDialog():
+            stored = edc.set_export(export_list, datestamp)
+        export = edc.get_export(export_list)
+        if not stored and not export:
+            from xbmcgui import Dialog
+            from tmdbhelper.lib.addon.plugin import get_localized, ADDONNAME
+            Dialog().ok(ADDONNAME, get_localized(32058))
+    edc.close()
+    if not export:
+        return
+    return DailyExportList(export_list, export[1], sorting=sorting, reverse=reverse)
 
 
 def get_all_items_list(tmdb_type, page=None):
@@ -322,6 +323,9 @@ def get_basic_list(
 
     length = length or self.page_length
 
+    def _get_request(page):
+        return self.get_request_sc(path, **{**kwargs, 'page': page})
+
     def _get_page(page):
         kwargs['page'] = page
         return self.get_request_sc(path, **kwargs)
@@ -350,10 +354,25 @@ def get_basic_list(
             response = _get_random()
             results = _get_results(response)
             return response, results
-        results = []
         page = try_int(page, fallback=1)
-        for x in range(try_int(length, fallback=1)):
-            response = _get_page(page + x)
+        response = _get_page(page) or {}
+        results = _get_results(response)
+
+        # Get remaining pages up to total_pages concurrently after first page tells us how many pages there are
+        page_end = min(page + try_int(length, fallback=1) - 1, int(response.get('total_pages') or 1))
+        if page_end <= page or int(response.get('total_pages') or 1) <= int(response.get('page') or 1):
+            return response, results
+
+        from tmdbhelper.lib.addon.thread import ParallelThread
+        with ParallelThread(list(range(page + 1, page_end + 1)), _get_request) as pt:
+            responses = pt.queue
+
+        # Merge in page order stopping at first failed page so next_page continues from there
+        kwargs['page'] = page
+        for x, next_response in enumerate(responses, start=page + 1):
+            if not next_response:
+                break  # Keep page and total_pages of last loaded page so next_page resumes at failed page
+            kwargs['page'], response = x, next_response
             results += _get_results(response)
             if int(response.get('total_pages') or 1) <= int(response.get('page') or 1):
                 break
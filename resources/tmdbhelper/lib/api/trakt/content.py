@@ -196,6 +196,22 @@ class TraktMethods():
             self._get_sync_response = get_sync_response
             return self._get_sync_response(self, *args, **kwargs)
 
+    def get_sync_response_cached(self, *args, **kwargs):
+        try:
+            return self._get_sync_response_cached(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.sync import get_sync_response_cached
+            self._get_sync_response_cached = get_sync_response_cached
+            return self._get_sync_response_cached(self, *args, **kwargs)
+
+    def get_sync_response_incremental(self, *args, **kwargs):
+        try:
+            return self._get_sync_response_incremental(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.sync import get_sync_response_incremental
+            self._get_sync_response_incremental = get_sync_response_incremental
+            return self._get_sync_response_incremental(self, *args, **kwargs)
+
     def get_sync_configured(self, *args, **kwargs):
         try:
             return self._get_sync_configured(self, *args, **kwargs)
@@ -340,6 +356,22 @@ class TraktMethods():
             self._get_sync_ratings_episodes = get_sync_ratings_episodes
             return self._get_sync_ratings_episodes(self, *args, **kwargs)
 
+    def get_sync_snapshot(self, *args, **kwargs):
+        try:
+            return self._get_sync_snapshot(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.sync import get_sync_snapshot
+            self._get_sync_snapshot = get_sync_snapshot
+            return self._get_sync_snapshot(self, *args, **kwargs)
+
+    def is_sync_snapshot_current(self, *args, **kwargs):
+        try:
+            return self._is_sync_snapshot_current(self, *args, **kwargs)
+        except AttributeError:
+            from tmdbhelper.lib.api.trakt.methods.sync import is_sync_snapshot_current
+            self._is_sync_snapshot_current = is_sync_snapshot_current
+            return self._is_sync_snapshot_current(self, *args, **kwargs)
+
     def get_sync(self, *args, **kwargs):
         try:
             return self._get_sync(self, *args, **kwargs)
@@ -484,14 +516,6 @@ class TraktMethods():
             self._get_movie_playprogress = get_movie_playprogress
             return self._get_movie_playprogress(self, *args, **kwargs)
 
-    def get_episode_playprogress_list(self, *args, **kwargs):
-        try:
-            return self._get_episode_playprogress_list(self, *args, **kwargs)
-        except AttributeError:
-            from tmdbhelper.lib.api.trakt.methods.progress import get_episode_playprogress_list
-            self._get_episode_playprogress_list = get_episode_playprogress_list
-            return self._get_episode_playprogress_list(self, *args, **kwargs)
-
     def get_episode_playprogress(self, *args, **kwargs):
         try:
             return self._get_episode_playprogress(self, *args, **kwargs)
@@ -1,4 +1,5 @@
 from tmdbhelper.lib.addon.plugin import format_name
+from tmdbhelper.lib.files.cstats import add_cache_stat
 
 
 def is_authorized(func):
@@ -47,7 +48,9 @@ def use_lastupdated_cache(cache, func, *args, sync_info=None, cache_name='', **k
     # Return the cached response if show hasn't been modified on Trakt or watched since caching
     if cached_obj and cached_obj.get('response') and cached_obj.get('last_updated_at'):
         if cached_obj['last_updated_at'] == last_updated_at:
+            add_cache_stat('TraktLastUpdatedCache', 'hit')
             return cached_obj['response']
+    add_cache_stat('TraktLastUpdatedCache', 'stale' if cached_obj else 'miss')
 
     # Otherwise get a new response from Trakt and cache it with the timestamp
     # Cache is long (14 days) because we refresh earlier if last_updated_at timestamps change
@@ -81,10 +84,12 @@ def use_activity_cache(activity_type=None, activity_key=None, cache_days=None):
             # Get our cached object
             response = None
             cache_object = None
+            stats_name = f'TraktActivityCache.{func.__name__}'
             if last_activity == -1:  # Cache only mode
                 cache_object = func_get(cache_name)
                 if cache_object:
                     response = cache_object.get('response')
+                add_cache_stat(stats_name, 'hit' if response else 'miss')
                 return response
             if last_activity and not decorator_cache_refresh:
                 cache_object = func_get(cache_name)
@@ -93,7 +98,9 @@ def use_activity_cache(activity_type=None, activity_key=None, cache_days=None):
             if cache_object and cache_object.get('response'):
                 if cache_object.get('last_activity') >= last_activity:
                     response = cache_object['response']
+                    add_cache_stat(stats_name, 'hit')
                     return response
+            add_cache_stat(stats_name, 'refresh' if decorator_cache_refresh else 'stale' if cache_object else 'miss')
 
             def _get_fallback():
                 _cache_object = cache_object
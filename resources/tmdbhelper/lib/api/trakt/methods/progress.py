@@ -1,6 +1,5 @@
 from tmdbhelper.lib.api.trakt.decorators import use_activity_cache, is_authorized
 from tmdbhelper.lib.addon.consts import CACHE_SHORT, CACHE_LONG
-from tmdbhelper.lib.addon.thread import use_thread_lock
 
 
 def get_ondeck_list(self, page=1, limit=None, sort_by=None, sort_how=None, trakt_type=None):
@@ -306,82 +305,31 @@ def get_movie_playprogress(self, unique_id, id_type, key='progress'):
         return
 
 
-@use_thread_lock("TraktAPI.get_episode_playprogress_list.Locked", timeout=10, polling=0.05)
-@use_activity_cache('episodes', 'paused_at', cache_days=CACHE_LONG)
-def get_episode_playprogress_list(self, id_type):
-    from tmdbhelper.lib.files.futils import pickle_deepcopy
-
-    sync_list = self.get_sync('playback', 'show')
-    if not sync_list:
-        return {}
-
-    main_list = {}
-
-    def _get_tv_show():
-        try:
-            return main_list[show_id]
-        except KeyError:
-            pass
-        try:
-            return pickle_deepcopy(i['show'])
-        except KeyError:
-            return {}
-
-    def _get_episode():
-        try:
-            return pickle_deepcopy(i['episode'])
-        except KeyError:
-            return {}
-
-    for i in sync_list:
-        try:
-            show_id = i['show']['ids'][id_type]
-        except KeyError:
-            continue
-
-        tv_show = _get_tv_show()
-        seasons = tv_show.setdefault('seasons', {})
-        episode = _get_episode()
-        season = seasons.setdefault(episode.get('season', 0), {})
-        season[episode.get('number', 0)] = i
-        main_list[show_id] = tv_show
-
-    return main_list
-
-
 @use_activity_cache('episodes', 'paused_at', cache_days=CACHE_LONG)
 def get_episode_playprogress(self, unique_id, id_type, season, episode, key='progress'):
     from jurialmunkey.parser import try_int
+    from tmdbhelper.lib.api.trakt.methods.sync import get_sync_nested
     season = try_int(season, fallback=-2)  # Make fallback -2 to prevent matching on 0
     episode = try_int(episode, fallback=-2)  # Make fallback -2 to prevent matching on 0
-    playprogress = self.get_episode_playprogress_list(id_type)
-    if not playprogress or unique_id not in playprogress:
-        return
     try:
-        return playprogress[unique_id]['seasons'][season][episode][key]
-    except (KeyError, AttributeError):
+        return get_sync_nested(self.get_sync('playback', 'show', id_type)[unique_id], season, episode)[key]
+    except (KeyError, AttributeError, TypeError):
         return
 
 
 @use_activity_cache('episodes', 'watched_at', cache_days=CACHE_LONG)
 def get_episode_playcount(self, unique_id, id_type, season, episode):
     from jurialmunkey.parser import try_int
+    from tmdbhelper.lib.api.trakt.methods.sync import get_sync_nested
     season = try_int(season, fallback=-2)  # Make fallback -2 to prevent matching on 0
     episode = try_int(episode, fallback=-2)  # Make fallback -2 to prevent matching on 0
     try:
-        response = self.get_sync('watched', 'show', id_type, extended='full')[unique_id]['seasons']
+        sync_item = self.get_sync('watched', 'show', id_type, extended='full')[unique_id]
     except (KeyError, AttributeError):
         return
-    for i in response:
-        if i.get('number', -1) != season:
-            continue
-        try:
-            episodes = i['episodes']
-        except KeyError:
-            continue
-        for j in episodes:
-            if j.get('number', -1) == episode:
-                return j.get('plays', 1)
+    episode_item = get_sync_nested(sync_item, season, episode)
+    if episode_item:
+        return episode_item.get('plays', 1)
 
 
 def get_episodes_airedcount(self, unique_id, id_type, season=None):
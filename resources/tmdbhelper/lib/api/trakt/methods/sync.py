@@ -3,6 +3,17 @@ from tmdbhelper.lib.addon.consts import CACHE_SHORT, CACHE_LONG
 from tmdbhelper.lib.addon.thread import use_thread_lock
 
 
+INCREMENTAL_SYNC_PATHS = {  # Sync paths which can be updated from sync/history {path: (activity_type, activity_key, history_type)}
+    'sync/watched/shows': ('episodes', 'watched_at', 'episodes'),
+    'sync/watched/movies': ('movies', 'watched_at', 'movies'),
+}
+INCREMENTAL_SYNC_LIMIT = 100  # Maximum history items to merge before refetching full list instead
+INCREMENTAL_SYNC_REFRESH = 24 * 60 * 60  # Seconds before full list is refetched as a consistency fallback
+INCREMENTAL_SYNC_TOLERANCE = 5 * 60  # Seconds newest merged watched_at can be behind activity before refetching full list
+SYNC_SNAPSHOT_NAME = 'TraktSync'
+SYNC_SNAPSHOT_MINUTES = 24 * 60
+
+
 def get_sync_item(self, trakt_type, unique_id, id_type, season=None, episode=None):
     """ Gets an item configured for syncing as postdata """
     if not unique_id or not id_type or not trakt_type:
@@ -57,14 +68,155 @@ def sync_item(self, method, trakt_type, unique_id, id_type, season=None, episode
     return self.post_response('sync', method, postdata={f'{trakt_type}s': [item]})
 
 
-@use_activity_cache(cache_days=CACHE_SHORT)
 def get_sync_response(self, path, extended=None, allow_fallback=False):
     """ Quick sub-cache routine to avoid recalling full sync list if we also want to quicklist it """
     sync_name = f'sync_response.{path}.{extended}'
-    self.sync[sync_name] = self.sync.get(sync_name) or self.get_response_json(path, extended=extended)
+    func = self.get_sync_response_incremental if path in INCREMENTAL_SYNC_PATHS else self.get_sync_response_cached
+    self.sync[sync_name] = self.sync.get(sync_name) or func(path, extended=extended, allow_fallback=allow_fallback)
     return self.sync[sync_name]
 
 
+@use_activity_cache(cache_days=CACHE_SHORT)
+def get_sync_response_cached(self, path, extended=None):
+    return self.get_response_json(path, extended=extended)
+
+
+def get_sync_response_incremental(self, path, extended=None, allow_fallback=False):
+    """
+    Get sync list and keep it updated by merging sync/history since the previous activity
+    Full list is refetched if history can't be merged or after INCREMENTAL_SYNC_REFRESH as a consistency fallback
+    """
+    from tmdbhelper.lib.addon.plugin import format_name
+    from tmdbhelper.lib.addon.tmdate import set_timestamp
+    activity_type, activity_key, history_type = INCREMENTAL_SYNC_PATHS[path]
+    cache_name = format_name('TraktAPI.get_sync_response_incremental.', path, extended=extended)
+    cache_object = self._cache.get_cache(cache_name) or {}
+    cache_response = cache_object.get('response')
+    last_activity = self.get_last_activity(activity_type, activity_key)
+
+    if last_activity == -1:  # Cache only mode
+        return cache_response
+
+    def _set_cache(response, refresh):
+        self._cache.set_cache(
+            {'response': response, 'last_activity': last_activity, 'refresh': refresh},
+            cache_name=cache_name, cache_days=CACHE_LONG)
+        return response
+
+    def _get_full_response():
+        response = self.get_response_json(path, extended=extended)
+        if not response:
+            return cache_response if allow_fallback else response
+        return _set_cache(response, set_timestamp(INCREMENTAL_SYNC_REFRESH, True))
+
+    def _get_delta_response():
+        history = self.get_response_json(
+            'sync/history', history_type,
+            start_at=cache_object['last_activity'], limit=INCREMENTAL_SYNC_LIMIT)
+        if not history or not isinstance(history, list) or len(history) >= INCREMENTAL_SYNC_LIMIT:
+            return
+        if not is_sync_history_current(history, last_activity):
+            return
+        response = merge_sync_history(cache_response, history, cache_object['last_activity'], extended=extended)
+        if not response:
+            return
+        return _set_cache(response, cache_object['refresh'])
+
+    if not last_activity or not cache_response or not cache_object.get('last_activity'):
+        return _get_full_response()
+
+    if cache_object['last_activity'] >= last_activity:
+        return cache_response
+
+    if (cache_object.get('refresh') or 0) < set_timestamp(0, True):
+        return _get_full_response()
+
+    return _get_delta_response() or _get_full_response()
+
+
+def is_sync_history_current(history, last_activity):
+    """
+    Check newest history item accounts for activity so that history wasn't changed in a way deltas don't include
+    History start_at filters on watched_at so items added with an earlier watched_at (e.g. watched at release date) are
+    not returned even though adding them moved activity. Returns False if caller should refetch full list instead
+    """
+    from tmdbhelper.lib.addon.tmdate import convert_timestamp
+    try:
+        newest = max(i['watched_at'] for i in history if i.get('watched_at'))
+    except (ValueError, TypeError):
+        return False
+    newest, last_activity = convert_timestamp(newest), convert_timestamp(last_activity)
+    if not newest or not last_activity:
+        return False
+    return (last_activity - newest).total_seconds() <= INCREMENTAL_SYNC_TOLERANCE
+
+
+def merge_sync_history(response, history, previous_activity, extended=None):
+    """
+    Merge sync/history items watched after previous_activity into sync/watched movies or shows response
+    Returns None if history can't be merged so caller should refetch full list instead:
+    - No history after previous activity (activity changed due to removal from history which isn't in deltas)
+    - New item not in response and response needs extended details not included in history
+    """
+    history = [i for i in history if i.get('watched_at') and i['watched_at'] > previous_activity]
+    if not history:
+        return
+
+    def _get_item(i_type, ids):
+        try:
+            return items_dict[ids['trakt']]
+        except KeyError:
+            pass
+        if extended:
+            return
+        item = {'plays': 0, 'last_watched_at': None, 'last_updated_at': None, i_type: i[i_type]}
+        if i_type == 'show':
+            item['seasons'] = []
+            item['reset_at'] = None
+        response.append(item)
+        items_dict[ids['trakt']] = item
+        return item
+
+    def _set_played(item):
+        item['plays'] = (item.get('plays') or 0) + 1
+        item['last_watched_at'] = max(item.get('last_watched_at') or '', i['watched_at'])
+        return item
+
+    def _set_episode_played(item):
+        seasons = item.setdefault('seasons', [])
+        s_num, e_num = i['episode'].get('season'), i['episode'].get('number')
+        for season in seasons:
+            if season.get('number') == s_num:
+                break
+        else:
+            season = {'number': s_num, 'episodes': []}
+            seasons.append(season)
+        episodes = season.setdefault('episodes', [])
+        for episode in episodes:
+            if episode.get('number') == e_num:
+                break
+        else:
+            episode = {'number': e_num, 'plays': 0, 'last_watched_at': None}
+            episodes.append(episode)
+        _set_played(episode)
+
+    try:
+        i_type = 'show' if history[0]['type'] == 'episode' else history[0]['type']
+        items_dict = {i[i_type]['ids']['trakt']: i for i in response}
+        for i in reversed(history):  # History is newest first so merge oldest first
+            item = _get_item(i_type, i[i_type]['ids'])
+            if not item:
+                return
+            _set_played(item)
+            item['last_updated_at'] = max(item.get('last_updated_at') or '', i['watched_at'])
+            if i_type == 'show':
+                _set_episode_played(item)
+    except (KeyError, TypeError, AttributeError):
+        return
+
+    return response
+
+
 @is_authorized
 def get_sync_configured(self, path, trakt_type, id_type=None, extended=None, allow_fallback=False):
     """ Get sync list """
@@ -77,6 +229,7 @@ def get_sync_configured(self, path, trakt_type, id_type=None, extended=None, all
         return
 
     sync_dict = {}
+    seasons_dict = {}  # Lookup of {(key, season_number): season_item} to avoid scanning seasons_list per episode
     for i in response:
 
         # Only add items that have that have an ID for id_type
@@ -104,41 +257,83 @@ def get_sync_configured(self, path, trakt_type, id_type=None, extended=None, all
             new_season_item = i
             new_season_item.update(i['season'])
             seasons_list.append(new_season_item)
+            seasons_dict.setdefault((key, new_season_item.get('number')), new_season_item)
             continue
 
         s_num = i['episode']['season']
 
-        for season in seasons_list:
-            if season.get('number') == s_num:
-                episodes_list = season.setdefault('episodes', [])
-                break
-        else:
+        try:
+            episodes_list = seasons_dict[(key, s_num)].setdefault('episodes', [])
+        except KeyError:
             episodes_list = []
-            seasons_list.append({'number': s_num, 'episodes': episodes_list})
+            seasons_dict[(key, s_num)] = {'number': s_num, 'episodes': episodes_list}
+            seasons_list.append(seasons_dict[(key, s_num)])
 
         new_episode_item = i
         new_episode_item.update(i['episode'])
         episodes_list.append(new_episode_item)
 
+    if trakt_type != 'show':
+        return sync_dict
+
+    for i in sync_dict.values():
+        set_seasons_index(i)
+
     return sync_dict
 
 
-def is_sync(self, trakt_type, unique_id, season=None, episode=None, id_type=None, sync_type=None):
-    """ Returns item if item in sync list else None """
-    from jurialmunkey.parser import try_int
+def set_seasons_index(sync_item):
+    """
+    Add seasons_index to show sync item mapping "S{season}" and "S{season}E{episode}" to positions in seasons/episodes lists
+    Keys are prefixed so that they aren't converted to int keys when loaded from json in cache
+    """
+    try:
+        seasons = sync_item['seasons']
+    except (KeyError, TypeError):
+        return
+    seasons_index = {}
+    for s_pos, season in enumerate(seasons or []):
+        s_num = season.get('number')
+        if f'S{s_num}' in seasons_index:  # Only index first season with number to match order of linear lookup
+            continue
+        seasons_index[f'S{s_num}'] = s_pos
+        for e_pos, episode in enumerate(season.get('episodes') or []):
+            seasons_index.setdefault(f'S{s_num}E{episode.get("number")}', e_pos)
+    sync_item['seasons_index'] = seasons_index
+    return sync_item
+
+
+def get_sync_nested(sync_item, season, episode=None):
+    """ Returns season item (or episode item if episode not None) from show sync item """
 
-    def _is_nested():
+    def _get_nested_indexed():
+        try:
+            seasons_index = sync_item['seasons_index']
+        except KeyError:
+            return _get_nested()
+        try:
+            season_item = sync_item['seasons'][seasons_index[f'S{season}']]
+        except (KeyError, IndexError, TypeError):
+            return _get_nested()  # Index miss so check list in case index is out of step with seasons
+        if episode is None:
+            return season_item
+        try:
+            return season_item['episodes'][seasons_index[f'S{season}E{episode}']]
+        except (KeyError, IndexError, TypeError):
+            return _get_nested()
+
+    def _get_nested():
+        """ Linear lookup fallback for sync items cached without an index """
         try:
             sync_item_seasons = sync_item['seasons']
         except (KeyError, AttributeError):
             return
         if not sync_item_seasons:
             return
-        se_n, ep_n = try_int(season), try_int(episode)
         for i in sync_item_seasons:
-            if se_n != i.get('number'):
+            if season != i.get('number'):
                 continue
-            if ep_n is None:
+            if episode is None:
                 return i
             try:
                 sync_item_episodes = i['episodes']
@@ -147,9 +342,18 @@ def is_sync(self, trakt_type, unique_id, season=None, episode=None, id_type=None
             if not sync_item_episodes:
                 return
             for j in sync_item_episodes:
-                if ep_n == j.get('number'):
+                if episode == j.get('number'):
                     return j
 
+    try:
+        return _get_nested_indexed()
+    except (TypeError, AttributeError, IndexError):
+        return
+
+
+def is_sync(self, trakt_type, unique_id, season=None, episode=None, id_type=None, sync_type=None):
+    """ Returns item if item in sync list else None """
+    from jurialmunkey.parser import try_int
     sync_list = self.get_sync(sync_type, trakt_type, id_type)
     try:
         sync_item = sync_list[unique_id]
@@ -157,7 +361,7 @@ def is_sync(self, trakt_type, unique_id, season=None, episode=None, id_type=None
         return
     if season is None:
         return sync_item
-    return _is_nested()
+    return get_sync_nested(sync_item, try_int(season), try_int(episode))
 
 
 @use_activity_cache('movies', 'watched_at', CACHE_LONG)
@@ -276,6 +480,44 @@ def get_sync(self, sync_type, trakt_type, id_type=None, extended=None):
 
     func = routes[sync_type][trakt_type]
     fallback = {} if id_type else []  # ID Type lookup via dict whilst raw response is list
-    sync_name = f'{sync_type}.{trakt_type}.{id_type}.{extended}'
-    self.sync[sync_name] = self.sync.get(sync_name) or func(trakt_type, id_type, extended)
+    sync_name = get_sync_snapshot_name(sync_type, trakt_type, id_type, extended)
+    self.sync[sync_name] = self.sync.get(sync_name) or self.get_sync_snapshot(func, sync_name, trakt_type, id_type, extended)
     return self.sync[sync_name] or fallback
+
+
+def get_sync_snapshot_name(sync_type, trakt_type, id_type=None, extended=None):
+    return f'{sync_type}.{trakt_type}.{id_type}.{extended}'
+
+
+def is_sync_snapshot_current(self, sync_type, trakt_type, id_type=None, extended=None):
+    """ Checks small version entry of snapshot against last activity without loading the snapshot itself """
+    last_activity = self.get_last_activity()
+    if not last_activity or last_activity == -1:
+        return False
+    from tmdbhelper.lib.files.mcache import FileMemoryCache
+    cache = FileMemoryCache(SYNC_SNAPSHOT_NAME)
+    return cache.get(f'{get_sync_snapshot_name(sync_type, trakt_type, id_type, extended)}.version') == last_activity
+
+
+def get_sync_snapshot(self, func, sync_name, *args, **kwargs):
+    """
+    Shares configured sync lists between plugin invocations as binary snapshot files versioned by last activity
+    Avoids reading and reconfiguring sync json from database on every invocation if nothing has changed on Trakt
+    Version is also stored as a separate small entry so that it can be checked without loading the snapshot
+    """
+    last_activity = self.get_last_activity()
+    if not last_activity or last_activity == -1:
+        return func(*args, **kwargs)
+
+    from tmdbhelper.lib.files.mcache import FileMemoryCache
+    cache = FileMemoryCache(SYNC_SNAPSHOT_NAME)
+    if cache.get(f'{sync_name}.version') == last_activity:
+        snapshot = cache.get(sync_name)
+        if snapshot and snapshot.get('last_activity') == last_activity:
+            return snapshot.get('response')
+
+    response = func(*args, **kwargs)
+    if response:
+        cache.set(sync_name, {'last_activity': last_activity, 'response': response}, cache_minutes=SYNC_SNAPSHOT_MINUTES)
+        cache.set(f'{sync_name}.version', last_activity, cache_minutes=SYNC_SNAPSHOT_MINUTES)  # Set after snapshot
+    return response
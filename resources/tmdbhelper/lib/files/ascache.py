@@ -0,0 +1,186 @@
+import sqlite3
+from tmdbhelper.lib.addon.plugin import ADDONDATA
+from tmdbhelper.lib.addon.logger import kodi_log
+from jurialmunkey.parser import try_int
+
+
+AIRING_DATABASE = 'AiringSchedule.db'
+AIRING_PREFIX = 'next_aired'
+AIRING_SOURCE_EXPIRY = 3600  # Seconds before a list refreshes its own source if service hasn't refreshed it
+AIRING_NOT_AIRING_DAYS = 1  # Show without a next episode so check again tomorrow
+AIRING_ENDED_DAYS = 30  # Check in a month just in case gets renewed on another network
+AIRING_THIS_WEEK_DAYS = 1  # Item airing this week so check again tomorrow in case schedule changes
+AIRING_LATER_DAYS = 7  # Item airing in more than a week so let's check next week just in case of changes
+
+
+def get_library_seeds():
+    """ Returns list of tvshows in Kodi library to seed airing schedule """
+    from tmdbhelper.lib.api.kodi.rpc import get_kodi_library
+    kodi_db = get_kodi_library('tv')
+    if not kodi_db or not kodi_db.database:
+        return []
+    return kodi_db.database
+
+
+def get_trakt_seeds(trakt_api):
+    """ Returns list of tvshows in Trakt watched history to seed airing schedule """
+    _dummydict = {}
+    items = trakt_api.get_sync('watched', 'show', 'tmdb', extended='full') or {}
+    return [{
+        'tmdb_id': k,
+        'imdb_id': v.get('show', _dummydict).get('ids', _dummydict).get('imdb', ''),
+        'tvdb_id': v.get('show', _dummydict).get('ids', _dummydict).get('tvdb', ''),
+        'title': v.get('show', _dummydict).get('title', ''),
+        'year': v.get('show', _dummydict).get('year', '')}
+        for k, v in items.items() if k and v]
+
+
+class AiringScheduleCache():
+    """
+    Index of next aired episode for tvshows keyed by air date
+    Sources such as library or trakt hold which tvshows belong to each list
+    Shows are only looked up again once their own expiry passes so that lists are a range query on air date
+    """
+
+    def __init__(self, tmdb_api=None):
+        from xbmcvfs import translatePath
+        self.database = translatePath(f'{ADDONDATA}{AIRING_DATABASE}')
+        self._tmdb_api = tmdb_api
+
+    @property
+    def tmdb_api(self):
+        if not self._tmdb_api:
+            from tmdbhelper.lib.api.tmdb.api import TMDb
+            self._tmdb_api = TMDb()
+        return self._tmdb_api
+
+    @property
+    def connection(self):
+        try:
+            return self._connection
+        except AttributeError:
+            self._connection = sqlite3.connect(self.database, timeout=30)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS shows(tmdb_id INTEGER PRIMARY KEY, airdate TEXT, expires INTEGER, item TEXT)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS shows_airdate ON shows(airdate)')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS seeds(source TEXT, tmdb_id INTEGER, tvshowtitle TEXT, PRIMARY KEY (source, tmdb_id))')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS sources(source TEXT PRIMARY KEY, updated INTEGER)')
+            return self._connection
+
+    def close(self):
+        try:
+            self._connection.close()
+            del self._connection
+        except AttributeError:
+            return
+
+    def get_sources(self):
+        """ Returns dict of {source: updated} for sources which have been listed at least once """
+        return dict(self.connection.execute('SELECT source, updated FROM sources').fetchall())
+
+    def is_expired_source(self, source):
+        from time import time
+        try:
+            return self.get_sources()[source] + AIRING_SOURCE_EXPIRY < time()
+        except KeyError:
+            return True
+
+    def get_nextaired_row(self, tmdb_id):
+        """ Lookup next aired episode for tvshow and return (tmdb_id, airdate, expires, item) row for shows table """
+        from json import dumps
+        from time import time
+        from tmdbhelper.lib.addon.tmdate import date_in_range
+        from tmdbhelper.lib.api.mapping import get_empty_item
+
+        prefix = AIRING_PREFIX
+        ip = self.tmdb_api.get_tvshow_nextaired(tmdb_id)
+        item_airdate = ip.get(f'{prefix}.original') if ip else None
+        if not item_airdate:
+            return (tmdb_id, None, int(time()) + AIRING_NOT_AIRING_DAYS * 86400, None)
+
+        status = ip.get('status')
+        if status in ['Canceled', 'Ended']:
+            cache_days = AIRING_ENDED_DAYS
+        elif date_in_range(item_airdate, 10, -2, date_fmt="%Y-%m-%d", date_lim=10):
+            cache_days = AIRING_THIS_WEEK_DAYS
+        else:
+            cache_days = AIRING_LATER_DAYS
+
+        item = get_empty_item()
+        item['infoproperties'] = ip
+        item['infolabels']['mediatype'] = 'episode'
+        item['infolabels']['title'] = ip.get(f'{prefix}.name')
+        item['infolabels']['episode'] = ip.get(f'{prefix}.episode')
+        item['infolabels']['season'] = ip.get(f'{prefix}.season')
+        item['infolabels']['plot'] = ip.get(f'{prefix}.plot')
+        item['infolabels']['year'] = ip.get(f'{prefix}.year')
+        item['infolabels']['premiered'] = item_airdate
+        item['art']['thumb'] = ip.get(f'{prefix}.thumb')
+        item['label'] = f"{item['infolabels']['title']} ({item_airdate})"
+        item['infoproperties']['tmdb_type'] = 'episode'
+        item['infoproperties']['tmdb_id'] = item['unique_ids']['tvshow.tmdb'] = tmdb_id
+        item['params'] = {
+            'info': 'details',
+            'tmdb_type': 'tv',
+            'tmdb_id': tmdb_id,
+            'episode': item['infolabels']['episode'],
+            'season': item['infolabels']['season']}
+        return (tmdb_id, item_airdate[:10], int(time()) + cache_days * 86400, dumps(item))
+
+    def get_seed_rows(self, source, seed_items):
+        """ Resolve tmdb_id of seed items and return (source, tmdb_id, tvshowtitle) rows for seeds table """
+        from tmdbhelper.lib.addon.thread import ParallelThread
+
+        def _get_seed_row(i):
+            tmdb_id = i.get('tmdb_id') or self.tmdb_api.get_tmdb_id(
+                tmdb_type='tv', imdb_id=i.get('imdb_id'), tvdb_id=i.get('tvdb_id'),
+                query=i.get('showtitle') or i.get('title'), year=i.get('year'))
+            tmdb_id = try_int(tmdb_id)
+            if not tmdb_id:
+                return
+            return (source, tmdb_id, i.get('showtitle') or i.get('title'))
+
+        with ParallelThread(seed_items, _get_seed_row) as pt:
+            seed_rows = pt.queue
+        return [i for i in seed_rows if i]
+
+    def refresh(self, source, seed_items):
+        """ Replace tvshows for source and lookup next aired for any tvshows which have expired """
+        from time import time
+        from tmdbhelper.lib.addon.thread import ParallelThread
+
+        seed_rows = self.get_seed_rows(source, seed_items or [])
+        with self.connection as connection:
+            connection.execute('DELETE FROM seeds WHERE source=?', (source, ))
+            connection.executemany('INSERT OR REPLACE INTO seeds VALUES (?, ?, ?)', seed_rows)
+            connection.execute('INSERT OR REPLACE INTO sources VALUES (?, ?)', (source, int(time())))
+
+        unexpired = {i[0] for i in self.connection.execute('SELECT tmdb_id FROM shows WHERE expires>?', (int(time()), ))}
+        expired = list({i[1] for i in seed_rows if i[1] not in unexpired})
+        if expired:
+            with ParallelThread(expired, self.get_nextaired_row) as pt:
+                show_rows = [i for i in pt.queue if i]
+            with self.connection as connection:
+                connection.executemany('INSERT OR REPLACE INTO shows VALUES (?, ?, ?, ?)', show_rows)
+
+        # Remove tvshows no longer in any source
+        with self.connection as connection:
+            connection.execute('DELETE FROM shows WHERE tmdb_id NOT IN (SELECT tmdb_id FROM seeds)')
+
+        kodi_log(f'AiringScheduleCache refreshed {source} {len(seed_rows)} shows with {len(expired)} lookups', 1)
+
+    def get_items(self, source, airdate, start=0, limit=20, reverse=False):
+        """ Returns list of items for source airing on or after airdate ordered by airdate """
+        from json import loads
+        order = 'DESC' if reverse else 'ASC'
+        query = (
+            'SELECT shows.item, seeds.tvshowtitle FROM seeds JOIN shows ON seeds.tmdb_id=shows.tmdb_id '
+            f'WHERE seeds.source=? AND shows.airdate>=? ORDER BY shows.airdate {order}, seeds.tvshowtitle ASC '
+            'LIMIT ? OFFSET ?')
+        items = []
+        for data, tvshowtitle in self.connection.execute(query, (source, airdate, limit, start)):
+            item = loads(data)
+            item['infolabels']['tvshowtitle'] = tvshowtitle
+            items.append(item)
+        return items
@@ -1,18 +1,106 @@
 from tmdbhelper.lib.addon.logger import kodi_traceback
 from tmdbhelper.lib.files.scache import SimpleCache, SimpleCacheMem
+from tmdbhelper.lib.files.futils import get_filecache_name
+from tmdbhelper.lib.files.cstats import CACHE_STATS, CacheStatsTimer, add_cache_stat, get_payload_size
+from threading import Lock
+from timeit import default_timer as timer
 import jurialmunkey.bcache
 
 BasicCache = jurialmunkey.bcache.BasicCache
 use_simple_cache = jurialmunkey.bcache.use_simple_cache
+WRITE_QUEUE_CACHES = []  # BasicCache objects with pending write-behind queues
+
+
+def flush_write_queues(final=False):
+    """ Commit pending writes for all caches using a write-behind queue
+    final=True: Commit writes even if Kodi has requested abort (use when exiting)
+    """
+    while WRITE_QUEUE_CACHES:
+        WRITE_QUEUE_CACHES.pop().flush_write_queue(final=final)
 
 
 class BasicCache(jurialmunkey.bcache.BasicCache):
     _simplecache = SimpleCache
+    _write_queue = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._write_queue_lock = Lock()
 
     @staticmethod
     def kodi_traceback(exc, log_msg):
         kodi_traceback(exc, log_msg)
 
+    @property
+    def cache_stats_name(self):
+        return f'BasicCache.{getattr(self, "_filename", None) or "default"}'
+
+    def get_cache(self, cache_name):
+        with CacheStatsTimer(self.cache_stats_name) as cst:
+            my_object = super().get_cache(cache_name)
+            cst.event, cst.payload = ('hit', my_object) if my_object else ('miss', None)
+        return my_object
+
+    def get_many(self, cache_names):
+        """ Get multiple objects in one query. Returns dict of {cache_name: my_object} for items found in cache """
+        timer_a = timer()
+        try:
+            self.ret_cache()
+            endpoints = {get_filecache_name(i or ''): i for i in cache_names}
+            results = self._cache.get_many(list(endpoints))
+            results = {endpoints[k]: v for k, v in results.items() if v}
+        except Exception as exc:
+            self.kodi_traceback(exc, 'lib.addon.cache get_many')
+            results = {}
+        if not CACHE_STATS.enabled:
+            return results
+        seconds = timer() - timer_a
+        size = sum(get_payload_size(i) for i in results.values())
+        add_cache_stat(self.cache_stats_name, 'hit', seconds, size=size, count=len(results))
+        add_cache_stat(self.cache_stats_name, 'miss', count=len(cache_names) - len(results))
+        return results
+
+    def set_many(self, items, cache_days=14, final=False):
+        """ Set multiple objects in one transaction. Items is list of (my_object, cache_name) tuples """
+        try:
+            self.ret_cache()
+            items = [(get_filecache_name(cache_name or ''), my_object) for my_object, cache_name in items if my_object]
+            self._cache.set_many(items, cache_days=cache_days, final=final)
+        except Exception as exc:
+            self.kodi_traceback(exc, 'lib.addon.cache set_many')
+
+    @property
+    def is_write_queued(self):
+        return self._write_queue is not None
+
+    def start_write_queue(self):
+        """ Hold writes made with set_cache_queued until flush_write_queue is called """
+        with self._write_queue_lock:
+            if self._write_queue is not None:
+                return
+            self._write_queue = []
+            WRITE_QUEUE_CACHES.append(self)
+
+    def set_cache_queued(self, my_object, cache_name, cache_days=14):
+        """ Add object to write-behind queue if active otherwise set immediately """
+        with self._write_queue_lock:
+            if self._write_queue is not None:
+                self._write_queue.append((my_object, cache_name, cache_days))
+                return my_object
+        return self.set_cache(my_object, cache_name, cache_days=cache_days)
+
+    def flush_write_queue(self, final=False):
+        """ Commit queued writes in a single transaction per cache_days value and stop queueing """
+        with self._write_queue_lock:
+            write_queue, self._write_queue = self._write_queue, None
+        if not write_queue:
+            return
+        cache_days_items = {}
+        for my_object, cache_name, cache_days in write_queue:
+            cache_days_items.setdefault(cache_days, {})[cache_name] = my_object  # Later writes of same name replace earlier
+        for cache_days, items in cache_days_items.items():
+            self.set_many([(my_object, cache_name) for cache_name, my_object in items.items()], cache_days=cache_days, final=final)
+
 
 class BasicCacheMem(BasicCache):
     _simplecache = SimpleCacheMem
@@ -0,0 +1,142 @@
+from threading import Lock
+from timeit import default_timer as timer
+
+
+CACHE_STATS_EVENTS = ('hit', 'miss', 'stale', 'refresh')
+CACHE_STATS_PROPERTY = 'CacheStats'
+
+
+class CacheStats():
+    """ Counters of hits, misses, stale and refreshed lookups with bytes and time spent for each named cache """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._enabled = None
+        self.stats = {}
+
+    @property
+    def enabled(self):
+        """ Only count lookups if timer reports or traces are enabled so that cache lookups don't pay for stats """
+        if self._enabled is None:
+            from tmdbhelper.lib.addon.plugin import get_setting
+            self._enabled = bool(get_setting('timer_reports') or get_setting('timer_traces'))
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = bool(value)
+
+    @staticmethod
+    def get_empty_stats():
+        stats = {k: 0 for k in CACHE_STATS_EVENTS}
+        stats['bytes'] = 0
+        stats['time'] = 0.0
+        return stats
+
+    def add(self, name, event, seconds=0.0, size=0, count=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.stats.setdefault(name, self.get_empty_stats())
+            stats[event] += count
+            stats['bytes'] += size
+            stats['time'] += seconds
+
+    def pop_stats(self):
+        with self._lock:
+            stats, self.stats = self.stats, {}
+        return stats
+
+    def get_totals(self):
+        """ Returns sum of stats for all caches """
+        totals = self.get_empty_stats()
+        with self._lock:
+            for stats in self.stats.values():
+                for k in totals:
+                    totals[k] += stats[k]
+        return totals
+
+    @staticmethod
+    def merge_stats(stats, other):
+        for name, other_stats in other.items():
+            merged = stats.setdefault(name, CacheStats.get_empty_stats())
+            for k in merged:
+                merged[k] += other_stats.get(k) or 0
+        return stats
+
+    @staticmethod
+    def get_table(stats):
+        """ Returns stats formatted as a plain text table sorted by cache name """
+        if not stats:
+            return ''
+        width = max(len(i) for i in stats)
+        lines = [f'{"CACHE":<{width}} {"HIT":>7} {"MISS":>7} {"STALE":>7} {"RFRSH":>7} {"RATE":>6} {"KB":>9} {"SECS":>8}']
+        for name in sorted(stats):
+            i = stats[name]
+            lookups = i['hit'] + i['miss'] + i['stale']
+            rate = f'{i["hit"] * 100 // lookups}%' if lookups else '-'
+            lines.append(
+                f'{name:<{width}} {i["hit"]:>7} {i["miss"]:>7} {i["stale"]:>7} {i["refresh"]:>7} '
+                f'{rate:>6} {i["bytes"] / 1024:>9.1f} {i["time"]:>8.3f}')
+        return '\n'.join(lines)
+
+    @staticmethod
+    def get_saved_stats():
+        """ Returns stats saved by previous invocations to window property """
+        from json import loads
+        from jurialmunkey.window import get_property
+        try:
+            return loads(get_property(CACHE_STATS_PROPERTY) or '{}')
+        except ValueError:
+            return {}
+
+    def save_stats(self):
+        """ Merge stats from this invocation into window property and reset counters """
+        from json import dumps
+        from jurialmunkey.window import get_property
+        stats = self.pop_stats()
+        if not stats:
+            return
+        stats = self.merge_stats(self.get_saved_stats(), stats)
+        get_property(CACHE_STATS_PROPERTY, set_property=dumps(stats, separators=(',', ':')))
+
+    @staticmethod
+    def clear_saved_stats():
+        from jurialmunkey.window import get_property
+        get_property(CACHE_STATS_PROPERTY, clear_property=True)
+
+
+def get_payload_size(my_object):
+    """ Returns pickled size of object for caches which only return unpickled objects """
+    import pickle
+    if my_object is None:
+        return 0
+    try:
+        return len(pickle.dumps(my_object, protocol=pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return 0
+
+
+class CacheStatsTimer():
+    def __init__(self, name, event='miss'):
+        """ ContextManager for timing a cache lookup. Set event and size or payload on object before exiting
+        Payload size is measured after timer stops so that it doesn't count towards lookup time
+        """
+        self.name = name
+        self.event = event
+        self.size = 0
+        self.payload = None
+
+    def __enter__(self):
+        self.timer_a = timer() if CACHE_STATS.enabled else None
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self.timer_a is None:
+            return
+        seconds = timer() - self.timer_a
+        CACHE_STATS.add(self.name, self.event, seconds, self.size or get_payload_size(self.payload))
+
+
+CACHE_STATS = CacheStats()
+add_cache_stat = CACHE_STATS.add
@@ -0,0 +1,177 @@
+import sqlite3
+from tmdbhelper.lib.addon.plugin import ADDONDATA
+from tmdbhelper.lib.addon.logger import kodi_log, TimerFunc
+from jurialmunkey.parser import try_int
+
+
+EXPORT_DATABASE = 'DailyExports.db'
+EXPORT_URL = 'https://files.tmdb.org/p/exports/{export_list}_ids_{datestamp}.json.gz'
+EXPORT_BATCH_SIZE = 5000  # Rows parsed into memory before being written so that memory use stays flat
+EXPORT_SORTING = ('id', 'name', 'popularity')  # Keys stored in their own column which can be sorted by the database
+
+
+class DailyExportCache():
+    """
+    Store for TMDb daily id exports which are several hundred thousand lines long
+    Export is decompressed and parsed line by line straight into an indexed SQLite table
+    Pages are read directly by position so the full list is never held in memory
+    """
+
+    def __init__(self):
+        from xbmcvfs import translatePath
+        self.database = translatePath(f'{ADDONDATA}{EXPORT_DATABASE}')
+
+    @property
+    def connection(self):
+        try:
+            return self._connection
+        except AttributeError:
+            self._connection = sqlite3.connect(self.database, timeout=60, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')  # Pages can be read while another export is stored
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS exports(export_list TEXT PRIMARY KEY, datestamp TEXT, total INTEGER)')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS items('
+                'export_list TEXT, position INTEGER, id INTEGER, name TEXT, popularity REAL, data TEXT, '
+                'PRIMARY KEY (export_list, position)) WITHOUT ROWID')
+            # Downloads stream into a per connection temp table so that the database is only locked to swap rows in
+            self._connection.execute(
+                'CREATE TEMP TABLE IF NOT EXISTS staging('
+                'export_list TEXT, position INTEGER, id INTEGER, name TEXT, popularity REAL, data TEXT, '
+                'PRIMARY KEY (export_list, position)) WITHOUT ROWID')
+            return self._connection
+
+    def close(self):
+        try:
+            self._connection.close()
+            del self._connection
+        except AttributeError:
+            return
+
+    def get_export(self, export_list):
+        """ Returns (datestamp, total) of stored export or None if export not stored """
+        return self.connection.execute(
+            'SELECT datestamp, total FROM exports WHERE export_list=?', (export_list, )).fetchone()
+
+    @staticmethod
+    def get_export_lines(export_list, datestamp):
+        """ Generator of lines from gzipped export decompressed as they are downloaded """
+        import io
+        import gzip
+        from tmdbhelper.lib.files.downloader import Downloader
+        response = Downloader().open_url(EXPORT_URL.format(export_list=export_list, datestamp=datestamp), stream=True)
+        if not response:
+            return
+        with gzip.GzipFile(fileobj=response.raw) as downloaded_gzip:
+            for line in io.TextIOWrapper(downloaded_gzip, encoding='utf-8'):
+                yield line
+
+    @staticmethod
+    def get_export_rows(export_list, lines):
+        """ Generator of table rows from export lines with contiguous positions so pages can be read by range """
+        from json import loads as json_loads
+        position = 0
+        for line in lines:
+            try:
+                i = json_loads(line)
+            except ValueError:
+                continue
+            yield (export_list, position, try_int(i.get('id')), i.get('name'), i.get('popularity'), line.strip())
+            position += 1
+
+    def set_staging(self, export_list, datestamp):
+        """ Download export into temp staging table without locking database. Returns number of rows staged """
+        connection = self.connection
+        connection.execute('DELETE FROM staging WHERE export_list=?', (export_list, ))
+        rows = self.get_export_rows(export_list, self.get_export_lines(export_list, datestamp))
+        total = 0
+        while True:
+            batch = [row for _, row in zip(range(EXPORT_BATCH_SIZE), rows)]
+            if not batch:
+                break
+            connection.executemany('INSERT OR REPLACE INTO staging VALUES (?, ?, ?, ?, ?, ?)', batch)
+            total += len(batch)
+        return total
+
+    def set_export(self, export_list, datestamp):
+        """ Download and store export replacing older stored export. Returns True if export stored """
+        connection = self.connection
+
+        try:
+            with TimerFunc(f'DailyExportCache {export_list} download took', inline=True):
+                total = self.set_staging(export_list, datestamp)
+
+            if not total:
+                return False  # Download failed so keep any older export
+
+            connection.execute('BEGIN IMMEDIATE')
+
+            try:
+                # Check another call didn't store the export while we were downloading
+                export = self.get_export(export_list)
+                if export and export[0] == datestamp:
+                    connection.execute('COMMIT')
+                    return True
+
+                connection.execute('DELETE FROM items WHERE export_list=?', (export_list, ))
+                connection.execute('INSERT INTO items SELECT * FROM staging WHERE export_list=?', (export_list, ))
+                connection.execute('INSERT OR REPLACE INTO exports VALUES (?, ?, ?)', (export_list, datestamp, total))
+                connection.execute('COMMIT')
+
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+            kodi_log(f'DailyExportCache stored {total} items for {export_list} {datestamp}', 1)
+            return True
+
+        except Exception as exc:  # Includes sqlite3.OperationalError if database stayed locked past timeout
+            kodi_log(f'DailyExportCache failed to store {export_list} {datestamp}: {exc}', 1)
+            return False
+
+        finally:
+            connection.execute('DELETE FROM staging WHERE export_list=?', (export_list, ))
+
+    def get_items(self, export_list, start, stop, sorting=None, reverse=False):
+        """ Returns list of dicts from stored export for positions start to stop """
+        from json import loads as json_loads
+        if sorting not in EXPORT_SORTING and not reverse:  # Unsorted pages are a range lookup on primary key
+            query = 'SELECT data FROM items WHERE export_list=? AND position>=? AND position<? ORDER BY position'
+            return [json_loads(i[0]) for i in self.connection.execute(query, (export_list, start, stop))]
+        order = sorting if sorting in EXPORT_SORTING else 'position'
+        order = f'{order} {"DESC" if reverse else "ASC"}, position ASC'  # Position breaks ties so that pages are stable
+        query = f'SELECT data FROM items WHERE export_list=? ORDER BY {order} LIMIT ? OFFSET ?'
+        return [json_loads(i[0]) for i in self.connection.execute(query, (export_list, max(stop - start, 0), start))]
+
+
+class DailyExportList():
+    """ Sequence of a stored daily export which reads only the requested slice from the database """
+
+    def __init__(self, export_list, total, sorting=None, reverse=False):
+        self.export_list = export_list
+        self.total = total
+        self.sorting = sorting
+        self.reverse = reverse
+
+    def __len__(self):
+        return self.total
+
+    def __bool__(self):
+        return self.total > 0
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            key = key + self.total if key < 0 else key
+            try:
+                return self[key:key + 1][0]
+            except IndexError:
+                raise IndexError('DailyExportList index out of range')
+        start, stop, step = key.indices(self.total)
+        if step != 1:
+            raise ValueError('DailyExportList does not support slice step')
+        if start >= stop:
+            return []
+        edc = DailyExportCache()
+        items = edc.get_items(self.export_list, start, stop, sorting=self.sorting, reverse=self.reverse)
+        edc.close()
+        return items
@@ -45,6 +45,14 @@ def read_file(filepath):
     return content
 
 
+def get_modified_time(path):
+    """ Get modified time of file or folder. Returns 0 if unavailable """
+    try:
+        return xbmcvfs.Stat(path).st_mtime()
+    except Exception:
+        return 0
+
+
 def get_tmdb_id_nfo(basedir, foldername, tmdb_type='tv'):
     try:
         folder = basedir + foldername + '/'
@@ -146,14 +154,19 @@ def get_json_filecache(cache_name):
     cache_name = get_filecache_name(cache_name)
     if not cache_name:
         return
-    try:
-        with xbmcvfs.File(validate_join(get_write_path('pickle'), cache_name), 'r') as file:
-            cache_obj = json.load(file)
-    except (IOError, json.JSONDecodeError):
-        cache_obj = None
-    from tmdbhelper.lib.addon.tmdate import is_future_timestamp
-    if cache_obj and (not cache_obj.get('expires') or is_future_timestamp(cache_obj.get('expires', ''))):
-        return cache_obj.get('my_object')
+    from tmdbhelper.lib.files.cstats import CacheStatsTimer
+    with CacheStatsTimer('JSONFileCache') as cst:
+        try:
+            with xbmcvfs.File(validate_join(get_write_path('pickle'), cache_name), 'r') as file:
+                cache_obj = json.load(file)
+        except (IOError, json.JSONDecodeError):
+            cache_obj = None
+        from tmdbhelper.lib.addon.tmdate import is_future_timestamp
+        if cache_obj and (not cache_obj.get('expires') or is_future_timestamp(cache_obj.get('expires', ''))):
+            cst.event = 'hit'
+            return cache_obj.get('my_object')
+        if cache_obj:
+            cst.event = 'stale'
 
 
 def use_json_filecache(func, *args, cache_name='', cache_only=False, cache_refresh=False, **kwargs):
@@ -161,6 +174,9 @@ def use_json_filecache(func, *args, cache_name='', cache_only=False, cache_refre
     Simplecache takes func with args and kwargs
     Returns the cached item if it exists otherwise does the function
     """
+    if cache_refresh:
+        from tmdbhelper.lib.files.cstats import add_cache_stat
+        add_cache_stat('JSONFileCache', 'refresh')
     my_object = get_json_filecache(cache_name) if not cache_refresh else None
     if my_object:
         return my_object
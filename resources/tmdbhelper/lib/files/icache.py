@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import xbmcvfs
+from time import time
+from threading import Lock
+from tmdbhelper.lib.addon.plugin import get_setting, ADDONDATA
+from tmdbhelper.lib.addon.logger import kodi_log
+
+
+IMAGE_CACHE_FOLDERS = ('blur_v2', 'crop_v2', 'desaturate_v2', 'colors_v2')
+IMAGE_CACHE_DATABASE = 'ImageCache.db'
+IMAGE_CACHE_TARGET = 0.9  # Evict down to 90% of size cap so that we don't evict again on next poll
+SQLITE_MAX_VARIABLES = 900
+
+
+class ImageCache():
+    """
+    Index of manipulated images in addon_data with size and last access time
+    Accesses are queued in memory and written to index on cron thread along with least recently used eviction
+    """
+    _access_queue = {}
+    _access_lock = Lock()
+    _enabled = None  # Size cap setting read once and then updated by cron thread so that focus changes don't read settings
+
+    def __init__(self):
+        self.basedir = xbmcvfs.translatePath(get_setting('image_location', 'str') or ADDONDATA)
+        self.database = xbmcvfs.translatePath(f'{ADDONDATA}{IMAGE_CACHE_DATABASE}')
+
+    @classmethod
+    def is_enabled(cls):
+        if cls._enabled is None:
+            cls._enabled = bool(get_setting('image_cache_size', 'int'))
+        return cls._enabled
+
+    @classmethod
+    def set_enabled(cls, enabled):
+        """ Update size cap state and discard queued accesses when disabled so that queue doesn't grow """
+        cls._enabled = bool(enabled)
+        if not cls._enabled:
+            cls.pop_accessed()
+
+    @classmethod
+    def set_accessed(cls, filepath):
+        """ Record image access in memory. Cheap enough to call on every focus change """
+        if not cls.is_enabled():
+            return  # Nothing flushes queue when there is no size cap
+        with cls._access_lock:
+            cls._access_queue[filepath] = int(time())
+
+    @classmethod
+    def pop_accessed(cls):
+        with cls._access_lock:
+            access_queue, cls._access_queue = cls._access_queue, {}
+        return access_queue
+
+    @property
+    def connection(self):
+        try:
+            return self._connection
+        except AttributeError:
+            self._connection = sqlite3.connect(self.database, timeout=30)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS images(path TEXT PRIMARY KEY, folder TEXT, size INTEGER, accessed INTEGER)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS images_accessed ON images(accessed)')
+            return self._connection
+
+    def close(self):
+        try:
+            self._connection.close()
+            del self._connection
+        except AttributeError:
+            return
+
+    @staticmethod
+    def get_folder(filepath):
+        return os.path.basename(os.path.dirname(filepath))
+
+    def flush_accessed(self):
+        """ Write queued accesses to index """
+        values = []
+        for filepath, accessed in self.pop_accessed().items():
+            if not xbmcvfs.exists(filepath):
+                continue  # Image failed to save so don't index it
+            values.append((filepath, self.get_folder(filepath), xbmcvfs.Stat(filepath).st_size(), accessed))
+        if not values:
+            return
+        with self.connection as connection:
+            connection.executemany('INSERT OR REPLACE INTO images(path, folder, size, accessed) VALUES (?, ?, ?, ?)', values)
+
+    def scan(self):
+        """ Add images on disk missing from index using modified time as access time and remove index entries for deleted images """
+        on_disk = {}
+        for folder in IMAGE_CACHE_FOLDERS:
+            folderpath = os.path.join(self.basedir, folder, '')  # Join paths same as ImageFunctions so index keys match
+            if not xbmcvfs.exists(folderpath):
+                continue
+            for filename in xbmcvfs.listdir(folderpath)[1]:
+                filepath = os.path.join(folderpath, filename)
+                stat = xbmcvfs.Stat(filepath)
+                on_disk[filepath] = (filepath, folder, stat.st_size(), int(stat.st_mtime()))
+        indexed = {i[0] for i in self.connection.execute('SELECT path FROM images')}
+        deleted = [(i, ) for i in indexed if i not in on_disk]
+        missing = [v for k, v in on_disk.items() if k not in indexed]
+        with self.connection as connection:
+            connection.executemany('DELETE FROM images WHERE path=?', deleted)
+            connection.executemany('INSERT OR REPLACE INTO images(path, folder, size, accessed) VALUES (?, ?, ?, ?)', missing)
+
+    def get_total_size(self):
+        return self.connection.execute('SELECT SUM(size) FROM images').fetchone()[0] or 0
+
+    def evict(self, max_bytes):
+        """ Delete least recently used images until total size is below target. Returns number of images deleted """
+        total_size = self.get_total_size()
+        if total_size <= max_bytes:
+            return 0
+        target_size = max_bytes * IMAGE_CACHE_TARGET
+        evicted = []
+        for filepath, size in self.connection.execute('SELECT path, size FROM images ORDER BY accessed ASC'):
+            if total_size <= target_size:
+                break
+            if xbmcvfs.exists(filepath) and not xbmcvfs.delete(filepath):
+                continue  # Keep index entry for images we failed to delete so that we try again next poll
+            evicted.append(filepath)
+            total_size -= size
+        with self.connection as connection:
+            for x in range(0, len(evicted), SQLITE_MAX_VARIABLES):
+                chunk = evicted[x:x + SQLITE_MAX_VARIABLES]
+                connection.execute(f'DELETE FROM images WHERE path IN ({",".join("?" * len(chunk))})', chunk)
+        kodi_log(f'ImageCache evicted {len(evicted)} images', 1)
+        return len(evicted)
+
+    def get_usage(self):
+        """ Returns list of (folder, count, size) for images in index """
+        return self.connection.execute('SELECT folder, COUNT(*), SUM(size) FROM images GROUP BY folder ORDER BY folder').fetchall()
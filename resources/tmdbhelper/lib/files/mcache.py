@@ -1,49 +1,34 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 from xbmcgui import Window
-from tmdbhelper.lib.addon.plugin import format_name
+from tmdbhelper.lib.addon.plugin import format_name, get_setting
 from tmdbhelper.lib.addon.tmdate import set_timestamp
 from tmdbhelper.lib.files.futils import json_loads as data_loads
+from tmdbhelper.lib.files.cstats import CacheStatsTimer, add_cache_stat
 from json import dumps as data_dumps
 
 
 TIME_MINUTES = 60
+FILE_MEMCACHE_FOLDER = 'MemCache'
 
 
-class MemoryCache(object):
+def MemoryCache(name):
+    """ Factory to build MemoryCache object for backend set by user """
+    if get_setting('use_file_mem_cache'):
+        return FileMemoryCache(name)
+    return WindowMemoryCache(name)
+
+
+class _MemoryCache(object):
     def __init__(self, name):
-        self._win = Window(10000)
         self._sc_name = f'TMDBHelper.MemCache.{name}'
+        self._stats_name = f'MemoryCache.{name}'
 
     def get(self, endpoint):
-        '''
-            get object from cache and return the results
-            endpoint: the (unique) name of the cache object as reference
-        '''
-        cur_time = set_timestamp(0, True)
-
-        # Check expiration time
-        expr_endpoint = f'{self._sc_name}_expr_{endpoint}'
-        expr_propdata = self._win.getProperty(expr_endpoint)
-        if not expr_propdata or int(expr_propdata) <= cur_time:
-            return
-
-        # Retrieve data
-        data_endpoint = f'{self._sc_name}_data_{endpoint}'
-        data_propdata = self._win.getProperty(data_endpoint)
-        if not data_propdata:
-            return
-
-        return data_loads(data_propdata)
+        return
 
     def set(self, endpoint, data, cache_minutes=60):
-        """ set data in cache """
-        expires = set_timestamp(cache_minutes * TIME_MINUTES, True)
-        data = data_dumps(data, separators=(',', ':'))
-        expr_endpoint = f'{self._sc_name}_expr_{endpoint}'
-        data_endpoint = f'{self._sc_name}_data_{endpoint}'
-        self._win.setProperty(expr_endpoint, str(expires))
-        self._win.setProperty(data_endpoint, data)
+        return
 
     def use(
             self, func, *args, cache_name=None, cache_minutes=60, cache_combine_name=True,
@@ -53,6 +38,9 @@ class MemoryCache(object):
         if not cache_name or cache_combine_name:
             cache_name = format_name(cache_name, *args, **kwargs)
 
+        if cache_refresh:
+            add_cache_stat(self._stats_name, 'refresh')
+
         my_object = self.get(cache_name) if not cache_refresh else None
         empty_obj = f'{self._sc_name}_none_{cache_name}'
 
@@ -70,3 +58,104 @@ class MemoryCache(object):
 
         if cache_store_none:
             self.set(cache_name, empty_obj, cache_minutes)
+
+
+class WindowMemoryCache(_MemoryCache):
+    def __init__(self, name):
+        super().__init__(name)
+        self._win = Window(10000)
+
+    def get(self, endpoint):
+        '''
+            get object from cache and return the results
+            endpoint: the (unique) name of the cache object as reference
+        '''
+        with CacheStatsTimer(self._stats_name) as cst:
+            cur_time = set_timestamp(0, True)
+
+            # Check expiration time
+            expr_endpoint = f'{self._sc_name}_expr_{endpoint}'
+            expr_propdata = self._win.getProperty(expr_endpoint)
+            if not expr_propdata:
+                return
+            if int(expr_propdata) <= cur_time:
+                cst.event = 'stale'
+                return
+
+            # Retrieve data
+            data_endpoint = f'{self._sc_name}_data_{endpoint}'
+            data_propdata = self._win.getProperty(data_endpoint)
+            if not data_propdata:
+                return
+
+            cst.event, cst.size = 'hit', len(data_propdata)
+            return data_loads(data_propdata)
+
+    def set(self, endpoint, data, cache_minutes=60):
+        """ set data in cache """
+        expires = set_timestamp(cache_minutes * TIME_MINUTES, True)
+        data = data_dumps(data, separators=(',', ':'))
+        expr_endpoint = f'{self._sc_name}_expr_{endpoint}'
+        data_endpoint = f'{self._sc_name}_data_{endpoint}'
+        self._win.setProperty(expr_endpoint, str(expires))
+        self._win.setProperty(data_endpoint, data)
+
+
+class FileMemoryCache(_MemoryCache):
+    """
+    Stores objects as binary pickle files in addon profile folder with expiry timestamp in file header
+    Avoids serialising large objects (e.g. Kodi library snapshots) to json in window properties on every invocation
+    """
+    _header = '>Q'  # Unsigned 64bit expiry timestamp
+
+    def __init__(self, name):
+        from xbmcvfs import translatePath
+        from tmdbhelper.lib.files.futils import get_write_path, validify_filename
+        super().__init__(name)
+        self._path = translatePath(get_write_path(f'{FILE_MEMCACHE_FOLDER}/{validify_filename(name)}', True))
+
+    def _get_filepath(self, endpoint):
+        from hashlib import md5
+        from os.path import join
+        return join(self._path, f'{md5(endpoint.encode("utf-8")).hexdigest()}.pkl')
+
+    def get(self, endpoint):
+        '''
+            get object from cache and return the results
+            endpoint: the (unique) name of the cache object as reference
+        '''
+        import pickle
+        from struct import unpack, calcsize, error as struct_error
+        filepath = self._get_filepath(endpoint)
+        with CacheStatsTimer(self._stats_name) as cst:
+            try:
+                with open(filepath, 'rb') as f:
+                    expires, = unpack(self._header, f.read(calcsize(self._header)))
+                    if expires <= set_timestamp(0, True):
+                        cst.event = 'stale'
+                        return
+                    data = pickle.load(f)
+                    cst.event, cst.size = 'hit', f.tell()
+                    return data
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError, struct_error):
+                return  # Missing, truncated or corrupt file
+
+    def set(self, endpoint, data, cache_minutes=60):
+        """ set data in cache """
+        import os
+        import pickle
+        from struct import pack
+        from threading import get_ident
+        expires = set_timestamp(cache_minutes * TIME_MINUTES, True)
+        filepath = self._get_filepath(endpoint)
+        tempfile = f'{filepath}.{os.getpid()}.{get_ident()}.tmp'
+        try:
+            with open(tempfile, 'wb') as f:
+                f.write(pack(self._header, int(expires)))
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tempfile, filepath)  # Atomic replace so other invocations never read partially written file
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            try:
+                os.remove(tempfile)  # Don't leave partially written file behind
+            except OSError:
+                pass
@@ -3,7 +3,13 @@
 import jurialmunkey.scache
 from tmdbhelper.lib.addon.logger import kodi_log
 from tmdbhelper.lib.addon.plugin import get_setting
-from tmdbhelper.lib.files.futils import FileUtils
+from tmdbhelper.lib.addon.tmdate import set_timestamp
+from tmdbhelper.lib.files.futils import FileUtils, json_loads as data_loads
+from json import dumps as data_dumps
+
+
+TIME_DAYS = 60 * 60 * 24
+SQLITE_MAX_VARIABLES = 900  # Keep below default SQLITE_MAX_VARIABLE_NUMBER of 999 for older sqlite builds
 
 
 class SimpleCache(jurialmunkey.scache.SimpleCache):
@@ -15,6 +21,71 @@ class SimpleCache(jurialmunkey.scache.SimpleCache):
     def kodi_log(msg, level=0):
         kodi_log(msg, level)
 
+    def get_many(self, endpoints, cur_time=None):
+        '''
+            get multiple objects from cache in a single database query
+            endpoints: list of (unique) names of the cache objects as reference
+            returns dictionary of {endpoint: data} for unexpired objects found in cache
+        '''
+        cur_time = cur_time or set_timestamp(0, True)
+        results = {}
+
+        # Check memory cache first so we only query database for remainder
+        if self._memcache:
+            for endpoint in endpoints:
+                result = self._get_mem_cache(endpoint, cur_time)
+                if result:
+                    results[endpoint] = result
+
+        endpoints = [i for i in dict.fromkeys(endpoints) if i not in results]
+        for x in range(0, len(endpoints), SQLITE_MAX_VARIABLES):
+            chunk = tuple(endpoints[x:x + SQLITE_MAX_VARIABLES])
+            query = f'SELECT id, expires, data FROM simplecache WHERE id IN ({",".join("?" * len(chunk))})'
+            cache_data = self._execute_sql(query, chunk)
+            if not cache_data:
+                continue
+            for endpoint, expires, data in cache_data.fetchall():
+                if not data or int(expires) <= cur_time:
+                    continue
+                self._set_mem_cache(endpoint, expires, data) if self._memcache else None
+                results[endpoint] = data_loads(data)
+
+        return results
+
+    def _execute_sql_final(self, query, values):
+        '''
+            execute write on its own connection because _execute_sql skips work once abort is requested
+            used for final flush of queued writes when exiting
+        '''
+        import sqlite3
+        db_file = getattr(self, '_db_file', None)
+        if not db_file:
+            return self._execute_sql(query, values)
+        try:
+            with sqlite3.connect(db_file, timeout=5) as connection:
+                connection.executemany(query, values)
+        except sqlite3.Error as exc:
+            self.kodi_log(f'CACHE: Final write failed {exc}', 1)
+
+    def set_many(self, items, cache_days=30, final=False):
+        '''
+            set multiple objects in cache in a single database transaction
+            items: list of (endpoint, data) tuples
+            final: write even if abort has been requested
+        '''
+        if not items:
+            return
+        expires = set_timestamp(cache_days * TIME_DAYS, True)
+        values = []
+        for endpoint, data in items:
+            data = data_dumps(data, separators=(',', ':'))
+            self._set_mem_cache(endpoint, expires, data) if self._memcache else None
+            values.append((endpoint, expires, data, 0))
+        query = 'INSERT OR REPLACE INTO simplecache( id, expires, data, checksum) VALUES (?, ?, ?, ?)'
+        if final:
+            return self._execute_sql_final(query, values)
+        self._execute_sql(query, values)
+
 
 class SimpleCacheMem(SimpleCache):
     _memcache = True
@@ -3,6 +3,7 @@ from tmdbhelper.lib.items.artselect import _ArtworkSelector
 from tmdbhelper.lib.addon.plugin import get_setting
 from tmdbhelper.lib.items.listitem import ListItem
 from tmdbhelper.lib.files.bcache import BasicCacheMem
+from tmdbhelper.lib.files.cstats import add_cache_stat
 from tmdbhelper.lib.api.tmdb.api import TMDb
 from tmdbhelper.lib.api.fanarttv.api import FanartTV
 from tmdbhelper.lib.addon.tmdate import set_timestamp, get_timestamp
@@ -38,18 +39,22 @@ BACKFILL_BLACKLIST = ['poster']
 
 
 class ItemBuilder(_ArtworkSelector):
-    def __init__(self, tmdb_api=None, ftv_api=None, trakt_api=None, cache_only=False, log_timers=False, timer_lists: dict = None):
+    def __init__(
+            self, tmdb_api=None, ftv_api=None, trakt_api=None, cache_only=False, log_timers=False, timer_lists: dict = None,
+            log_timer_reports=False):
         self.parent_tv = {}
         self.parent_season = {}
         self.tmdb_api = tmdb_api or TMDb()
         self.ftv_api = ftv_api or FanartTV()
         self.trakt_api = trakt_api
         self._cache = BasicCacheMem(filename='ItemBuilder.db')
+        self._cache_prefetch = {}
         self._regex = re.compile(r'({})'.format('|'.join(IMAGEPATH_ALL)))
         self.parent_params = None
         self.cache_only = cache_only
         self.timer_lists = timer_lists if isinstance(timer_lists, dict) else {}
         self.log_timers = log_timers
+        self.log_timer_reports = log_timer_reports  # Only write to Kodi log if reports enabled not just traces
         self._yy = 0
         self.override = False if self.tmdb_api.iso_language == 'en' else True  # Override titles with TMDb translated data
         # self.__dict__.update(kwargs)
@@ -148,7 +153,7 @@ class ItemBuilder(_ArtworkSelector):
         with TimerList(self.timer_lists, 'item_tmdb', log_threshold=0.05, logging=self.log_timers) as tl:
             details = self.tmdb_api.get_details_request(tmdb_type, tmdb_id, season, episode, cache_refresh=cache_refresh)
             if not details:
-                if self.log_timers and tl.total_time > tl.log_threshold:  # TMDb API missing item so log fail time
+                if self.log_timer_reports and tl.total_time > tl.log_threshold:  # TMDb API missing item so log fail time
                     kodi_log(f'item_tmdb -- get_details_request({tmdb_type},{tmdb_id},{season},{episode}) FAILED after {tl.total_time:.3f} sec', 1)
                 return
             if season is not None:
@@ -170,13 +175,55 @@ class ItemBuilder(_ArtworkSelector):
         language = self.tmdb_api.language
         return f'v2.{language}.{tmdb_type}.{tmdb_id}.{season}.{episode}'
 
+    def get_cache(self, name):
+        """ Get item from prefetched cache items if available otherwise fallback to single lookup """
+        try:
+            item = self._cache_prefetch[name]
+        except KeyError:
+            add_cache_stat('ItemBuilder.prefetch', 'miss')
+            return self._cache.get_cache(name)
+        add_cache_stat('ItemBuilder.prefetch', 'hit')
+        return item
+
+    def set_cache(self, item, name):
+        """ Set item to cache and update prefetched item so that later lookups get current details """
+        if name in self._cache_prefetch or self._cache.is_write_queued:  # Queued writes aren't in db yet so keep locally
+            self._cache_prefetch[name] = item
+        return self._cache.set_cache_queued(item, name, cache_days=CACHE_DAYS)
+
+    def start_write_queue(self):
+        """ Queue cache writes until flush_write_queue so that they are committed in one transaction """
+        self._cache.start_write_queue()
+
+    def get_cache_names(self, tmdb_type, tmdb_id, season=None, episode=None):
+        """ Get cache name for item and its parent tvshow/season """
+        if not tmdb_type or not tmdb_id:
+            return []
+        names = [self.get_cache_name(tmdb_type, tmdb_id, season, episode)]
+        if season is not None:
+            names.append(self.get_cache_name(tmdb_type, tmdb_id, season if episode is not None else None))
+        return names
+
+    def prefetch_cache(self, items):
+        """ Retrieve cached details for all items in a single lookup before building items in threads """
+        with TimerList(self.timer_lists, 'item_pre', log_threshold=0.05, logging=self.log_timers):
+            names = []
+            for i in items:
+                if not i or i.get('next_page'):
+                    continue
+                names += self.get_cache_names(*self.get_listitem_ids(ListItem(**i)))
+            names = [i for i in dict.fromkeys(names) if i not in self._cache_prefetch]
+            if not names:
+                return
+            self._cache_prefetch.update(self._cache.get_many(names))
+
     def get_item(self, tmdb_type, tmdb_id, season=None, episode=None, cache_refresh=False):
         if not tmdb_type or not tmdb_id:
             return
 
         # Get cached item
         name = self.get_cache_name(tmdb_type, tmdb_id, season, episode)
-        item = None if cache_refresh else self._cache.get_cache(name)
+        item = None if cache_refresh else self.get_cache(name)
         if self.cache_only:
             return item
 
@@ -188,7 +235,8 @@ class ItemBuilder(_ArtworkSelector):
                 base_name_season = season
             parent = self.parent_tv if base_name_season is None else self.parent_season
             base_name = self.get_cache_name(tmdb_type, tmdb_id, base_name_season)
-            base_item = parent or self._cache.get_cache(base_name)
+            add_cache_stat('ItemBuilder.parent', 'hit' if parent else 'miss')
+            base_item = parent or self.get_cache(base_name)
 
         # Check that our current item hasn't expired and needs refreshing
         if item and get_timestamp(item['expires']):  # Our item hasn't expired
@@ -201,7 +249,7 @@ class ItemBuilder(_ArtworkSelector):
                 # Else we've got current item details but we need to grab some artwork or remap quality
                 prefix = 'tvshow.' if season is not None and episode is None else ''  # Seasons should map tvshow art with prefix
                 item = self.get_artwork(item, tmdb_type, season, episode, base_item, prefix=prefix)  # Get art and map it
-                return self._cache.set_cache(item, name, cache_days=CACHE_DAYS)  # Re-add our item to the cache with new details
+                return self.set_cache(item, name)  # Re-add our item to the cache with new details
 
         # Item isn't current so it needs a refresh but let's make sure we keep manually set artwork
         prefix = ''
@@ -228,7 +276,7 @@ class ItemBuilder(_ArtworkSelector):
             item_queue = pt.queue
         ftv_art = item_queue[0] if item_queue else None
         item = self.get_artwork(item, tmdb_type, season, episode, base_item, prefix=prefix, ftv_art=ftv_art)
-        return self._cache.set_cache(item, name, cache_days=CACHE_DAYS)
+        return self.set_cache(item, name)
 
     def get_item_artwork(self, artwork, art_dict=None, is_season=False):
         def set_artwork(details=None, blacklist=[]):
@@ -260,17 +308,22 @@ class ItemBuilder(_ArtworkSelector):
                 k: v for k, v in item['listitem']['infoproperties'].items()
                 if not re.match(r'.*\.[0-9]*\..*', k)}  # Filter out indexed properties to leave only basic props
             name = self.get_cache_name(tmdb_type, tmdb_id, season, episode)
-            self._cache.set_cache(item, name, cache_days=CACHE_DAYS)  # Set back to cache
+            self.set_cache(item, name)  # Set back to cache
         item['listitem']['infoproperties'] = item['infoproperties_basic']  # Set filtered ip to ip
         return item
 
-    def get_listitem(self, i, use_iterprops=True):
-        li = ListItem(parent_params=self.parent_params, **i)
+    def get_listitem_ids(self, li):
         mediatype = li.infolabels.get('mediatype')
         tmdb_type = li.tmdb_type
         tmdb_id = li.unique_ids.get('tvshow.tmdb') if mediatype in ['season', 'episode'] else li.unique_ids.get('tmdb')
         season = li.infolabels.get('season', 0) if mediatype in ['season', 'episode'] else None
         episode = li.infolabels.get('episode') if mediatype == 'episode' else None
+        return tmdb_type, tmdb_id, season, episode
+
+    def get_listitem(self, i, use_iterprops=True):
+        li = ListItem(parent_params=self.parent_params, **i)
+        mediatype = li.infolabels.get('mediatype')
+        tmdb_type, tmdb_id, season, episode = self.get_listitem_ids(li)
         item = self.get_item(tmdb_type, tmdb_id, season, episode)
         if not item or 'listitem' not in item:
             return li
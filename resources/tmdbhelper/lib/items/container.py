@@ -13,7 +13,9 @@ from tmdbhelper.lib.items.kodi import KodiDb
 class Container(CommonContainerAPIs):
     def __init__(self, handle, paramstring, **kwargs):
         # Log Settings
-        self.log_timers = get_setting('timer_reports')
+        self.log_timer_reports = get_setting('timer_reports')
+        self.log_timer_traces = get_setting('timer_traces')
+        self.log_timers = self.log_timer_reports or self.log_timer_traces  # Collect timer lists for either output
         self.timer_lists = {}
 
         # plugin:// params configuration
@@ -159,7 +161,7 @@ class Container(CommonContainerAPIs):
             from tmdbhelper.lib.items.builder import ItemBuilder
             self._ib = ItemBuilder(
                 tmdb_api=self.tmdb_api, ftv_api=self.ftv_api, trakt_api=self.trakt_api,
-                log_timers=self.log_timers, timer_lists=self.timer_lists)
+                log_timers=self.log_timers, timer_lists=self.timer_lists, log_timer_reports=self.log_timer_reports)
             return self._ib
 
     @property
@@ -213,6 +215,13 @@ class Container(CommonContainerAPIs):
                 li.infolabels['plot'] = f"{li.infoproperties['plot_affix']}. {li.infolabels.get('plot')}"
             return li
 
+    def prefetch_kodi_details(self, listitems):
+        """ Get Kodi library details for all items in one batched request before making items in threads """
+        if not self.kodi_db:
+            return
+        with TimerList(self.timer_lists, 'item_kdb', log_threshold=0.05, logging=self.log_timers):
+            self.kodi_db.prefetch_kodi_details(listitems)
+
     def _make_item(self, li):
         if not li:
             return
@@ -270,6 +279,8 @@ class Container(CommonContainerAPIs):
         self.ib.cache_only = self.tmdb_cache_only
         with TimerList(self.timer_lists, '--build', log_threshold=0.05, logging=self.log_timers):
             self.ib.parent_params = self.parent_params
+            self.ib.start_write_queue()  # Hold back cache writes until after directory is passed to Kodi
+            self.ib.prefetch_cache(items)  # Get cached details for all items in one lookup so threads only miss to API
             with ParallelThread(items, self._build_item) as pt:
                 item_queue = pt.queue
             all_listitems = [i for i in item_queue if i]
@@ -283,6 +294,7 @@ class Container(CommonContainerAPIs):
             info = self.parent_params.get('info')
             self.format_episode_labels = info not in NO_LABEL_FORMATTING
             self.remove_episode_counts = info in REMOVE_EPISODE_COUNT
+            self.prefetch_kodi_details(all_listitems)
             with ParallelThread(all_listitems, self._make_item) as pt:
                 item_queue = pt.queue
 
@@ -293,6 +305,12 @@ class Container(CommonContainerAPIs):
 
         return item_queue
 
+    def flush_write_queue(self):
+        """ Commit cache writes queued during build in one transaction """
+        from tmdbhelper.lib.files.bcache import flush_write_queues
+        with TimerList(self.timer_lists, '--write', log_threshold=0.05, logging=self.log_timers):
+            flush_write_queues()
+
     def add_items(self, items):
         from xbmcplugin import addDirectoryItems
         addDirectoryItems(self.handle, [(li.get_url(), li.get_listitem(), li.is_folder) for li in items if li])
@@ -362,6 +380,28 @@ class Container(CommonContainerAPIs):
         """
         return
 
+    def log_cache_stats(self):
+        """ Log cache stats for this directory with timer reports and save them for the cache_stats script action """
+        from tmdbhelper.lib.files.cstats import CACHE_STATS
+        if self.log_timer_reports and CACHE_STATS.stats:
+            from tmdbhelper.lib.addon.logger import kodi_log
+            kodi_log(['CACHE STATS: ', self.paramstring, '\n', CACHE_STATS.get_table(CACHE_STATS.stats)], 1)
+        if self.log_timers:  # Only pay for merging into window property when user has enabled reports or traces
+            CACHE_STATS.save_stats()
+
+    def log_timer_trace(self, items):
+        """ Append trace of timer totals and cache stats for this directory to trace file """
+        from tmdbhelper.lib.addon.timertrace import write_timer_trace
+        from tmdbhelper.lib.addon.thread import ParallelThread
+        from tmdbhelper.lib.files.cstats import CACHE_STATS
+        cache_stats = CACHE_STATS.get_totals()
+        write_timer_trace(
+            self.timer_lists, self.paramstring,
+            route=self.params.get('info'),
+            items=len([i for i in items if i]) if items else 0,
+            threads=ParallelThread.thread_max,
+            cache={k: cache_stats[k] for k in ('hit', 'miss', 'stale', 'refresh')})
+
     def get_directory(self, items_only=False, build_items=True):
         from threading import Thread
         with TimerList(self.timer_lists, 'total', logging=self.log_timers):
@@ -375,13 +415,19 @@ class Container(CommonContainerAPIs):
                 return items
             self.property_params = self.set_params_to_container()
             self.plugin_category = self.params.get('plugin_category') or self.plugin_category
-            with TimerList(self.timer_lists, 'add_items', logging=self.log_timers):
-                items = self.build_items(items)
-                if items_only:
-                    return items
-                self.add_items(items)
-            self.finish_container()
-        if self.log_timers:
+            try:
+                with TimerList(self.timer_lists, 'add_items', logging=self.log_timers):
+                    items = self.build_items(items)
+                    if items_only:
+                        return items
+                    self.add_items(items)
+                self.finish_container()
+            finally:
+                self.flush_write_queue()  # Commit queued cache writes even if building directory failed
+        if self.log_timer_traces:
+            self.log_timer_trace(items)
+        self.log_cache_stats()
+        if self.log_timer_reports:
             from tmdbhelper.lib.addon.logger import log_timer_report
             log_timer_report(self.timer_lists, self.paramstring)
         if self.container_update:
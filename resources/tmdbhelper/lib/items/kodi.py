@@ -1,14 +1,29 @@
 from tmdbhelper.lib.api.mapping import set_show, get_empty_item
-from tmdbhelper.lib.api.kodi.rpc import get_kodi_library, get_movie_details, get_tvshow_details, get_episode_details, get_season_details
+from tmdbhelper.lib.api.kodi.rpc import get_kodi_library, get_item_details_batch, map_item_details, ITEM_DETAILS
+from tmdbhelper.lib.api.kodi.rpc import get_movie_details, get_tvshow_details, get_episode_details, get_season_details
 
 
 class KodiDb():
     def __init__(self, tmdb_type):
         self.kodi_db_tv = {}
         self.kodi_db = get_kodi_library(tmdb_type)
+        self.kodi_details = {}  # Raw details prefetched in batch {(key, dbid): details}
 
-    def get_kodi_details(self, li):
-        """ Pass through listitem to get Kodi details """
+    def get_details(self, key, dbid):
+        """ Get mapped details from prefetched batch if available otherwise lookup single item """
+        try:
+            return map_item_details(self.kodi_details[(key, dbid)], dbid, key)
+        except KeyError:
+            pass
+        func = {
+            'movie': get_movie_details,
+            'tvshow': get_tvshow_details,
+            'season': get_season_details,
+            'episode': get_episode_details}
+        return func[key](dbid)
+
+    def get_kodi_dbids(self, li):
+        """ Get (key, dbid, child_key, child_dbid) for listitem where child is season/episode of tvshow """
 
         def _get_dbid():
             """ Get dbid for movie / tvshow """
@@ -30,44 +45,62 @@ class KodiDb():
                 tvdb_id=li.unique_ids.get('tvshow.tvdb'),
                 title=li.infolabels.get('tvshowtitle'))
 
-        def _get_child_details():
+        def _get_child_dbid():
             season, episode = li.infolabels.get('season'), li.infolabels.get('episode')
-
-            library, func = 'season', get_season_details
-            if episode is not None:
-                library, func = 'episode', get_episode_details
-
-            kodi_db_tv = self.kodi_db_tv.setdefault(dbid, get_kodi_library(library, dbid))
-            child_dbid = kodi_db_tv.get_info('dbid', season=season, episode=episode)
-            if not child_dbid:
-                return
-
-            details = func(child_dbid)
-            details['infoproperties']['tvshow.dbid'] = dbid
-            return details
+            library = 'season' if episode is None else 'episode'
+            kodi_db_tv = self.kodi_db_tv.setdefault((library, dbid), get_kodi_library(library, dbid))
+            return library, kodi_db_tv.get_info('dbid', season=season, episode=episode)
 
         if not self.kodi_db:
             return
 
         routes = {
-            'movie': {
-                'get_dbid': _get_dbid,
-                'get_details': get_movie_details},
-            'tvshow': {
-                'get_dbid': _get_dbid,
-                'get_details': get_tvshow_details},
-            'season': {
-                'get_dbid': _get_tvshow_dbid,
-                'get_details': lambda x: set_show(_get_child_details() or get_empty_item(), get_tvshow_details(x))},
-            'episode': {
-                'get_dbid': _get_tvshow_dbid,
-                'get_details': lambda x: set_show(_get_child_details() or get_empty_item(), get_tvshow_details(x))}}
+            'movie': _get_dbid,
+            'tvshow': _get_dbid,
+            'season': _get_tvshow_dbid,
+            'episode': _get_tvshow_dbid}
         try:
-            route = routes[li.infolabels['mediatype']]
+            mediatype = li.infolabels['mediatype']
+            route = routes[mediatype]
         except KeyError:
             return
 
-        dbid = route['get_dbid']()
+        dbid = route()
         if not dbid:
             return
-        return route['get_details'](dbid)
+        if mediatype in ('movie', 'tvshow'):
+            return (mediatype, dbid, None, None)
+        return ('tvshow', dbid, *_get_child_dbid())
+
+    def prefetch_kodi_details(self, listitems):
+        """ Get Kodi details for all listitems in one batched JSON-RPC request """
+        items = []
+        for li in listitems:
+            dbids = self.get_kodi_dbids(li) if li else None
+            if not dbids:
+                continue
+            key, dbid, child_key, child_dbid = dbids
+            items.append((key, dbid))
+            if child_dbid:
+                items.append((child_key, child_dbid))
+        items = [i for i in items if i not in self.kodi_details and i[0] in ITEM_DETAILS]
+        if not items:
+            return
+        self.kodi_details.update(get_item_details_batch(items))
+
+    def get_kodi_details(self, li):
+        """ Pass through listitem to get Kodi details """
+        dbids = self.get_kodi_dbids(li)
+        if not dbids:
+            return
+
+        key, dbid, child_key, child_dbid = dbids
+        if not child_key:
+            return self.get_details(key, dbid)
+
+        details = None
+        if child_dbid:
+            details = self.get_details(child_key, child_dbid)
+            if details:
+                details['infoproperties']['tvshow.dbid'] = dbid
+        return set_show(details or get_empty_item(), self.get_details(key, dbid))
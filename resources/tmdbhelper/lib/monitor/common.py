@@ -3,9 +3,12 @@ from tmdbhelper.lib.addon.plugin import get_infolabel, get_condvisibility
 from tmdbhelper.lib.addon.tmdate import convert_timestamp, get_region_date
 from tmdbhelper.lib.addon.logger import kodi_try_except, kodi_log
 from tmdbhelper.lib.files.futils import validate_join
+from tmdbhelper.lib.files.cstats import add_cache_stat
 from tmdbhelper.lib.api.kodi.rpc import get_person_stats
 from tmdbhelper.lib.api.contains import CommonContainerAPIs
 from jurialmunkey.parser import try_int
+from threading import Lock
+from timeit import default_timer as timer
 import xbmcvfs
 import json
 
@@ -41,6 +44,11 @@ SETBASE = {
     'base_director', 'base_writer'
 }
 
+RATINGS_TIMEOUT = 1.5  # Seconds to wait for a ratings provider before publishing without it
+RATINGS_TIMEOUTS = {'omdb': 3, 'mdblist': 3}  # Slower providers allowed longer before publishing
+RATINGS_TIMEOUT_LATE = 10  # Seconds to keep waiting for late providers to patch in their results
+RATINGS_WORKERS = 14  # Threads shared by all ratings lookups so that scrolling doesn't start new threads per item
+
 TVDB_AWARDS_KEYS = {
     'Academy Awards': 'academy',
     'Golden Globe Awards': 'goldenglobe',
@@ -52,6 +60,18 @@ TVDB_AWARDS_KEYS = {
 
 
 class CommonMonitorDetails(CommonContainerAPIs):
+    _ratings_executor = None
+    _ratings_executor_lock = Lock()
+
+    @classmethod
+    def get_ratings_executor(cls):
+        """ Executor shared by all monitors for ratings providers """
+        with cls._ratings_executor_lock:
+            if not cls._ratings_executor:
+                from concurrent.futures import ThreadPoolExecutor
+                cls._ratings_executor = ThreadPoolExecutor(max_workers=RATINGS_WORKERS, thread_name_prefix='ratings')
+            return cls._ratings_executor
+
     def __init__(self):
         self.imdb_top250 = {}
         self._item_memory_cache = {}
@@ -68,7 +88,9 @@ class CommonMonitorDetails(CommonContainerAPIs):
             return self._ib
 
     def use_item_memory_cache(self, cache_name, func, *args, **kwargs):
-        cache_data = self._item_memory_cache.get(cache_name) or func(*args, **kwargs)
+        cache_data = self._item_memory_cache.get(cache_name)
+        add_cache_stat('MonitorItemMemoryCache', 'hit' if cache_data else 'miss')
+        cache_data = cache_data or func(*args, **kwargs)
         if not cache_data:
             return
         self._item_memory_cache[cache_name] = cache_data
@@ -188,18 +210,102 @@ class CommonMonitorDetails(CommonContainerAPIs):
                 item['infoproperties'][f'{t}_cr'] = '[CR]'.join(all_awards_cr)
         return item
 
-    def get_all_ratings(self, item, tmdb_type, tmdb_id, season=None, episode=None):
+    def get_ratings_providers(self, tmdb_type, tmdb_id, trakt_type, season=None, episode=None):
+        """ Returns tuple of (name, func, kwargs) for ratings lookups
+        Order of providers determines precedence of values when merging so later providers override earlier
+        """
+        return (
+            ('omdb', self.get_omdb_ratings, {}),
+            ('top250', self.get_imdb_top250_rank, {'trakt_type': trakt_type}),
+            ('trakt', self.get_trakt_ratings, {'trakt_type': trakt_type, 'season': season, 'episode': episode}),
+            ('trakt_episode_type', self.get_trakt_episode_type, {'season': season, 'episode': episode}),
+            ('tvdb_awards', self.get_tvdb_awards, {'tmdb_type': tmdb_type, 'tmdb_id': tmdb_id}),
+            ('mdblist', self.get_mdblist_ratings, {'trakt_type': trakt_type, 'tmdb_id': tmdb_id}),
+            ('nextaired', self.get_nextaired, {'tmdb_type': tmdb_type, 'tmdb_id': tmdb_id}))
+
+    @staticmethod
+    def merge_ratings(item, results, names):
+        """ Merge provider results into item in provider order so that the merge is deterministic """
+        for name in names:
+            try:
+                result = results[name]
+            except KeyError:
+                continue  # Provider not finished yet
+            if not result:
+                continue
+            item['infoproperties'].update(result.get('infoproperties') or {})
+            item['infolabels'].update(result.get('infolabels') or {})
+        return item
+
+    def get_all_ratings(self, item, tmdb_type, tmdb_id, season=None, episode=None, on_late=None):
+        """ Lookup ratings from all providers concurrently
+        Returns item with results from providers that finished before their timeout
+        Optional on_late callback is called with a copy of item including late providers once they all finish
+        Callers should check item is still focused in on_late and only apply it after writing the returned item
+        """
         try:
             trakt_type = {'movie': 'movie', 'tv': 'show'}[tmdb_type]
         except KeyError:
             return item  # Only lookup ratings for movie or tvshow
-        item = self.get_omdb_ratings(item)
-        item = self.get_imdb_top250_rank(item, trakt_type=trakt_type)
-        item = self.get_trakt_ratings(item, trakt_type, season=season, episode=episode)
-        item = self.get_trakt_episode_type(item, season=season, episode=episode)
-        item = self.get_tvdb_awards(item, tmdb_type, tmdb_id)
-        item = self.get_mdblist_ratings(item, trakt_type, tmdb_id)
-        item = self.get_nextaired(item, tmdb_type, tmdb_id)
+
+        item.setdefault('infoproperties', {})
+        item.setdefault('infolabels', {})
+        providers = self.get_ratings_providers(tmdb_type, tmdb_id, trakt_type, season=season, episode=episode)
+        names = [name for name, func, kwargs in providers]
+        results = {}
+        infolabels = {**item['infolabels']}  # Original infolabels which providers read from e.g. imdbnumber
+
+        def _get_ratings(name, func, kwargs):
+            # Each provider gets its own copy of mutable dicts so that providers don't write to the same dict
+            _item = {**item, 'infoproperties': {}, 'infolabels': {**infolabels}}
+            try:
+                _item = func(_item, **kwargs) or {}
+            except Exception as exc:
+                kodi_log(f'lib.monitor.common get_all_ratings {name}: {exc}', 1)
+                return
+            # Only keep infolabels the provider changed so that merge doesn't overwrite other providers with originals
+            results[name] = {
+                'infoproperties': _item.get('infoproperties') or {},
+                'infolabels': {k: v for k, v in (_item.get('infolabels') or {}).items() if infolabels.get(k) != v}}
+
+        from concurrent.futures import wait
+        executor = self.get_ratings_executor()
+        futures = []
+        timer_a = timer()
+        for name, func, kwargs in providers:
+            future = executor.submit(_get_ratings, name, func, kwargs)
+            futures.append((future, timer_a + RATINGS_TIMEOUTS.get(name, RATINGS_TIMEOUT)))
+
+        for future, deadline in futures:
+            wait([future], timeout=max(deadline - timer(), 0))
+
+        late = [future for future, deadline in futures if not future.done()]
+        item = self.merge_ratings(item, dict(results), names)
+        if not late:
+            return item
+
+        kodi_log(f'Ratings lookup {tmdb_type} {tmdb_id} published without {len(late)} late providers', 2)
+
+        if not on_late:
+            return item
+
+        # Late results are merged into a copy so that the item returned to the caller is never mutated afterwards
+        late_item = {**item, 'infoproperties': {**item['infoproperties']}, 'infolabels': {**item['infolabels']}}
+        late_deadline = timer() + RATINGS_TIMEOUT_LATE
+        late_lock = Lock()
+        published = len(results)
+
+        def _on_late_done(future):
+            with late_lock:
+                late.remove(future)
+                if late:
+                    return  # Wait for remaining late providers so that on_late is only called once
+            if timer() > late_deadline or len(results) == published:
+                return  # Too late to patch in or no late providers returned anything
+            on_late(self.merge_ratings(late_item, dict(results), names))
+
+        for future in list(late):
+            future.add_done_callback(_on_late_done)
         return item
 
     def get_person_stats(self, item, tmdb_type, tmdb_id):
@@ -227,20 +333,54 @@ class CommonMonitorFunctions(CommonMonitorDetails):
         self.properties = set()
         self.index_properties = set()
         self.property_prefix = 'ListItem'
+        self._property_state = {}  # Last value written to each window property {key: value} where None is cleared
+        self._property_state_lock = Lock()
+        self._ratings_lock = Lock()  # Sequences late ratings after initial ratings write
         super(CommonMonitorFunctions, self).__init__()
 
-    @kodi_try_except('lib.monitor.common clear_property')
+    def get_property_changes(self, properties: dict):
+        """ Returns properties with values that differ from last written value and records them as written
+        Values are converted to str as written to window property and None indicates property is cleared
+        Caller must hold _property_state_lock until changes are written so that state matches window
+        """
+        changes = {}
+        for k, v in properties.items():
+            k = f'{self.property_prefix}.{k}'
+            v = None if v is None else f'{v}'
+            if k in self._property_state and self._property_state[k] == v:
+                continue
+            self._property_state[k] = v
+            changes[k] = v
+        return changes
+
+    def reset_property_state(self, keys=None):
+        """ Forget last written values so that next write is issued regardless
+        Use for properties which are also set outside of monitor such as by image manipulations
+        """
+        with self._property_state_lock:
+            if keys is None:
+                self._property_state = {}
+                return
+            for k in keys:
+                self._property_state.pop(f'{self.property_prefix}.{k}', None)
+
+    @kodi_try_except('lib.monitor.common write_properties')
+    def write_properties(self, properties: dict):
+        """ Sets or clears window properties in one batch skipping those which are unchanged since last write
+        TMDbHelper.ListItem.{key} = properties[key] or cleared if properties[key] is None
+        """
+        with self._property_state_lock:
+            for k, v in self.get_property_changes(properties).items():
+                if v is None:
+                    get_property(k, clear_property=True)
+                    continue
+                get_property(k, set_property=v)
+
     def clear_property(self, key):
-        key = f'{self.property_prefix}.{key}'
-        get_property(key, clear_property=True)
+        self.write_properties({key: None})
 
-    @kodi_try_except('lib.monitor.common set_property')
     def set_property(self, key, value):
-        key = f'{self.property_prefix}.{key}'
-        if value is None:
-            get_property(key, clear_property=True)
-            return
-        get_property(key, set_property=f'{value}')
+        self.write_properties({key: value})
 
     @kodi_try_except('lib.monitor.common set_iter_properties')
     def set_iter_properties(self, dictionary: dict, keys: set):
@@ -250,12 +390,14 @@ class CommonMonitorFunctions(CommonMonitorDetails):
         """
         if not isinstance(dictionary, dict):
             dictionary = {}
+        properties = {}
         for k in keys:
             v = dictionary.get(k)
             if isinstance(v, list):
                 v = ' / '.join(v)
             self.properties.add(k)
-            self.set_property(k, v)
+            properties[k] = v
+        self.write_properties(properties)
 
     @kodi_try_except('lib.monitor.common set_indexed_properties')
     def set_indexed_properties(self, dictionary):
@@ -269,16 +411,13 @@ class CommonMonitorFunctions(CommonMonitorDetails):
             and k not in SETPROP_RATINGS
             and k not in SETMAIN_ARTWORK)
 
-        index_properties = set()
-
-        for k in keys:
-            v = dictionary.get(k)
-            self.set_property(k, v)
-            index_properties.add(k)
+        properties = {k: dictionary.get(k) for k in keys}
+        index_properties = set(properties)
 
         for k in (self.index_properties - index_properties):
-            self.clear_property(k)
+            properties[k] = None
 
+        self.write_properties(properties)
         self.index_properties = index_properties.copy()
 
     @kodi_try_except('lib.monitor.common set_list_properties')
@@ -295,10 +434,11 @@ class CommonMonitorFunctions(CommonMonitorDetails):
         minutes = duration // 60 % 60
         hours = duration // 60 // 60
         totalmin = duration // 60
-        self.set_property('Duration', totalmin)
-        self.set_property('Duration_H', hours)
-        self.set_property('Duration_M', minutes)
-        self.set_property('Duration_HHMM', f'{hours:02d}:{minutes:02d}')
+        self.write_properties({
+            'Duration': totalmin,
+            'Duration_H': hours,
+            'Duration_M': minutes,
+            'Duration_HHMM': f'{hours:02d}:{minutes:02d}'})
         self.properties.update(['Duration', 'Duration_H', 'Duration_M', 'Duration_HHMM'])
 
     @kodi_try_except('lib.monitor.common set_date_properties')
@@ -306,9 +446,10 @@ class CommonMonitorFunctions(CommonMonitorDetails):
         date_obj = convert_timestamp(premiered, time_fmt="%Y-%m-%d", time_lim=10)
         if not date_obj:
             return
-        self.set_property('Premiered', get_region_date(date_obj, 'dateshort'))
-        self.set_property('Premiered_Long', get_region_date(date_obj, 'datelong'))
-        self.set_property('Premiered_Custom', date_obj.strftime(get_infolabel('Skin.String(TMDbHelper.Date.Format)') or '%d %b %Y'))
+        self.write_properties({
+            'Premiered': get_region_date(date_obj, 'dateshort'),
+            'Premiered_Long': get_region_date(date_obj, 'datelong'),
+            'Premiered_Custom': date_obj.strftime(get_infolabel('Skin.String(TMDbHelper.Date.Format)') or '%d %b %Y')})
         self.properties.update(['Premiered', 'Premiered_Long', 'Premiered_Custom'])
 
     def set_base_properties(self, item):
@@ -334,13 +475,11 @@ class CommonMonitorFunctions(CommonMonitorDetails):
             self._cur_item = 0
             self._pre_item = 1
         ignore_keys = ignore_keys or set()
-        for k in self.properties - ignore_keys:
-            self.clear_property(k)
+        properties = {k: None for k in self.properties - ignore_keys}
+        properties.update({k: None for k in self.index_properties})
+        self.write_properties(properties)
         self.properties = set()
-        for k in self.index_properties:
-            self.clear_property(k)
         self.index_properties = set()
 
     def clear_property_list(self, properties):
-        for k in properties:
-            self.clear_property(k)
+        self.write_properties({k: None for k in properties})
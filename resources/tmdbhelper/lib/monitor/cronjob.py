@@ -1,4 +1,5 @@
 from threading import Thread
+from tmdbhelper.lib.addon.logger import kodi_try_except
 
 
 CRONJOB_POLL_TIME = 600
@@ -14,15 +15,21 @@ class CronJobMonitor(Thread):
         self.exit = False
         self.update_hour = update_hour
         self.xbmc_monitor = Monitor()
+        self.image_cache_scanned = False
 
     def _on_startup(self):
         self._do_delete_old_databases()
+        self._do_clean_file_memcache()
         self._do_recache_kodidb()
         self._do_trakt_authorization()
 
     def _on_poll(self):
         self._do_library_update_check()
         self._do_trakt_lastactivities_update()
+        self._do_trakt_sync_snapshot_update()
+        self._do_image_cache_eviction()
+        self._do_airing_schedule_update()
+        self._do_save_cache_stats()
 
     @property
     def trakt_api(self):
@@ -38,6 +45,11 @@ class CronJobMonitor(Thread):
         from tmdbhelper.lib.script.method.maintenance import clean_old_databases
         clean_old_databases()
 
+    @staticmethod
+    def _do_clean_file_memcache():
+        from tmdbhelper.lib.script.method.maintenance import clean_file_memcache
+        clean_file_memcache()
+
     @staticmethod
     def _do_recache_kodidb():
         from tmdbhelper.lib.script.method.maintenance import recache_kodidb
@@ -60,6 +72,70 @@ class CronJobMonitor(Thread):
             return
         self.trakt_api.get_last_activity(cache_refresh=True)
 
+    def _do_trakt_sync_snapshot_update(self):
+        """ Update shared sync snapshots in service so plugin invocations only need to read them """
+        from jurialmunkey.parser import boolean
+        from jurialmunkey.window import get_property
+        from tmdbhelper.lib.addon.plugin import get_setting
+        if not boolean(get_property('TraktIsAuth')):
+            return
+        if not get_setting('trakt_watchedindicators'):
+            return
+        for args, kwargs in (
+                (('watched', 'movie', 'tmdb'), {}),
+                (('watched', 'show', 'tmdb'), {'extended': 'full'})):
+            if self.trakt_api.is_sync_snapshot_current(*args, **kwargs):
+                continue  # Snapshot version matches last activity so no need to load it
+            self.trakt_api.sync = {}  # Clear instance sync dict so that snapshot is rebuilt
+            self.trakt_api.get_sync(*args, **kwargs)
+
+    def _do_image_cache_eviction(self):
+        """ Index accessed images and delete least recently used images when over size cap """
+        from tmdbhelper.lib.addon.plugin import get_setting
+        from tmdbhelper.lib.files.icache import ImageCache
+        max_megabytes = get_setting('image_cache_size', 'int')
+        ImageCache.set_enabled(max_megabytes)
+        if not max_megabytes:
+            return
+        image_cache = ImageCache()
+        if not self.image_cache_scanned:  # Index existing images once per session
+            image_cache.scan()
+            self.image_cache_scanned = True
+        image_cache.flush_accessed()
+        image_cache.evict(max_megabytes * 1024 * 1024)
+        image_cache.close()
+
+    @kodi_try_except('lib.monitor.cronjob _do_airing_schedule_update')
+    def _do_airing_schedule_update(self):
+        """ Refresh tvshows of airing next lists that have been opened so that lists only need to query index """
+        from jurialmunkey.parser import boolean
+        from jurialmunkey.window import get_property
+        from tmdbhelper.lib.files.ascache import AiringScheduleCache, get_library_seeds, get_trakt_seeds
+        if self.exit or self.xbmc_monitor.abortRequested():
+            return
+        airing_schedule = AiringScheduleCache()
+        try:
+            sources = airing_schedule.get_sources()
+            if 'library' in sources:
+                airing_schedule.refresh('library', get_library_seeds())
+            if self.exit or self.xbmc_monitor.abortRequested():
+                return  # Don't start next source lookups when Kodi is closing
+            if 'trakt' in sources and boolean(get_property('TraktIsAuth')):
+                airing_schedule.refresh('trakt', get_trakt_seeds(self.trakt_api))
+        finally:
+            airing_schedule.close()
+
+    @staticmethod
+    def _do_save_cache_stats():
+        """ Save cache stats of service monitors so that cache_stats report includes them """
+        from tmdbhelper.lib.addon.plugin import get_setting
+        from tmdbhelper.lib.files.cstats import CACHE_STATS
+        CACHE_STATS.enabled = get_setting('timer_reports') or get_setting('timer_traces')  # Pick up setting changes
+        if not CACHE_STATS.enabled:
+            CACHE_STATS.pop_stats()  # Discard so that counters don't accumulate for whole session
+            return
+        CACHE_STATS.save_stats()
+
     def _do_library_update(self):
         from tmdbhelper.lib.addon.plugin import executebuiltin
         from tmdbhelper.lib.addon.tmdate import get_datetime_now, get_timedelta
@@ -8,6 +8,7 @@ from jurialmunkey.window import get_property
 from tmdbhelper.lib.addon.plugin import get_infolabel, get_setting, ADDONDATA
 from jurialmunkey.parser import try_int, try_float
 from tmdbhelper.lib.files.futils import make_path
+from tmdbhelper.lib.files.icache import ImageCache
 from threading import Thread
 import urllib.request as urllib
 from tmdbhelper.lib.addon.logger import kodi_log
@@ -171,7 +172,7 @@ class ImageFunctions(Thread):
         filename = f'cropped-{md5hash(source)}.png'
         destination = os.path.join(self.save_path, filename)
         try:
-            if not xbmcvfs.exists(destination):  # Used to do os.utime(destination, None) on existing here
+            if not xbmcvfs.exists(destination):
                 img, targetfile = _openimage(source, self.save_path, filename)
                 try:
                     # Errors with single channel L conversion to RGBa so catch exceptions
@@ -185,6 +186,7 @@ class ImageFunctions(Thread):
                 _saveimage(img, destination)
                 _closeimage(img, targetfile)
 
+            ImageCache.set_accessed(destination)
             return destination
 
         except Exception as exc:
@@ -196,7 +198,7 @@ class ImageFunctions(Thread):
         filename = f'{md5hash(source)}-{self.radius}-{self.blur_size}.jpg'
         destination = os.path.join(self.save_path, filename)
         try:
-            if not xbmcvfs.exists(destination):  # os.utime(destination, None)
+            if not xbmcvfs.exists(destination):
                 img, targetfile = _openimage(source, self.save_path, filename)
                 img.thumbnail((self.blur_size, self.blur_size))
                 img = img.convert('RGB')
@@ -204,6 +206,7 @@ class ImageFunctions(Thread):
                 _saveimage(img, destination)
                 _closeimage(img, targetfile)
 
+            ImageCache.set_accessed(destination)
             return destination
 
         except Exception:
@@ -214,12 +217,13 @@ class ImageFunctions(Thread):
         filename = f'{md5hash(source)}.png'
         destination = os.path.join(self.save_path, filename)
         try:
-            if not xbmcvfs.exists(destination):  # os.utime(destination, None)
+            if not xbmcvfs.exists(destination):
                 img, targetfile = _openimage(source, self.save_path, filename)
                 img = img.convert('LA')
                 _saveimage(img, destination)
                 _closeimage(img, targetfile)
 
+            ImageCache.set_accessed(destination)
             return destination
 
         except Exception:
@@ -299,13 +303,14 @@ class ImageFunctions(Thread):
         targetfile = None
 
         try:
-            if xbmcvfs.exists(destination):  # os.utime(destination, None)
+            if xbmcvfs.exists(destination):
                 img = _imageopen(xbmcvfs.translatePath(destination))
             else:
                 img, targetfile = _openimage(source, self.save_path, filename)
                 img.thumbnail((128, 128))
                 img = img.convert('RGB')
                 _saveimage(img, destination)
+            ImageCache.set_accessed(destination)
 
             maincolor_rgb = self.get_maincolor(img)
             maincolor_hex = self.rgb_to_hex(*self.get_color_lumsat(*maincolor_rgb))
@@ -249,13 +249,15 @@ class ListItemDetails():
         return self._parent.get_person_stats(
             self._itemdetails.listitem, self._itemdetails.tmdb_type, self._itemdetails.tmdb_id)
 
-    def get_all_ratings(self, use_deepcopy=False):
+    def get_all_ratings(self, use_deepcopy=False, on_late=None):
         if self._itemdetails.tmdb_type not in ['movie', 'tv']:
             return {}
         if not self._itemdetails or not self._itemdetails.listitem:
             return {}
         _listitem = deepcopy(self._itemdetails.listitem) if use_deepcopy else self._itemdetails.listitem
-        return self._parent.get_all_ratings(_listitem, self._itemdetails.tmdb_type, self._itemdetails.tmdb_id, self._season, self._episode) or {}
+        return self._parent.get_all_ratings(
+            _listitem, self._itemdetails.tmdb_type, self._itemdetails.tmdb_id, self._season, self._episode,
+            on_late=on_late) or {}
 
     def get_nextaired(self):
         if not self._itemdetails or not self._itemdetails.listitem:
@@ -167,6 +167,7 @@ class ListItemMonitor(CommonMonitorFunctions):
     def clear_properties(self, ignore_keys=None):
         if not self._item or not self._item.get_artwork(source="Art(artist.clearlogo)|Art(tvshow.clearlogo)|Art(clearlogo)"):
             self.properties.update({'CropImage', 'CropImage.Original'})
+            self.reset_property_state({'CropImage', 'CropImage.Original'})  # Set by image manipulations not monitor
         super().clear_properties(ignore_keys=ignore_keys)
 
     @kodi_try_except('lib.monitor.listitem.blur_fallback')
@@ -207,7 +208,7 @@ class ListItemMonitor(CommonMonitorFunctions):
         _item.get_additional_properties()
         _listitem = self._last_listitem = _item.get_builtitem()
         _pre_item = self._pre_item
-        _detailed = {'artwork': None, 'ratings': None}
+        _detailed = {'artwork': None, 'ratings': None, 'late': None, 'written': False}
 
         if _pre_item != self.cur_item:
             return
@@ -219,8 +220,18 @@ class ListItemMonitor(CommonMonitorFunctions):
             _artwork.update(_item.get_image_manipulations(built_artwork=_artwork, use_winprops=True))
             _detailed['artwork'] = _artwork
 
+        def _process_late_ratings(_ratings):
+            # Late providers finished after listitem was readded so patch in if item still focused
+            with self._ratings_lock:
+                if _pre_item != self.cur_item:
+                    return
+                if not _detailed['written']:  # Initial write hasn't happened yet so let it use late ratings instead
+                    _detailed['late'] = _ratings.get('infoproperties')
+                    return
+                _listitem.setProperties(_ratings.get('infoproperties') or {})
+
         def _process_ratings():
-            _ratings = _item.get_all_ratings() or {}
+            _ratings = _item.get_all_ratings(on_late=_process_late_ratings) or {}
             _ratings = _ratings.get('infoproperties')
             _detailed['ratings'] = _ratings
 
@@ -240,11 +251,12 @@ class ListItemMonitor(CommonMonitorFunctions):
             get_property('IsUpdatingRatings', clear_property=True)
 
             # Check focused item is still the same before updating
-            if _pre_item != self.cur_item:
-                return
-
-            _listitem.setArt(_detailed['artwork'] or {}) if process_artwork else None
-            _listitem.setProperties(_detailed['ratings'] or {}) if process_ratings else None
+            with self._ratings_lock:
+                if _pre_item != self.cur_item:
+                    return
+                _listitem.setArt(_detailed['artwork'] or {}) if process_artwork else None
+                _listitem.setProperties(_detailed['late'] or _detailed['ratings'] or {}) if process_ratings else None
+                _detailed['written'] = True
 
         self.set_base_properties(_item._itemdetails.listitem)
 
@@ -272,12 +284,29 @@ class ListItemMonitor(CommonMonitorFunctions):
             thread_artwork = Thread(target=_process_artwork)
             thread_artwork.start()
 
+        # Patch in ratings from late providers if item still focused
+        _pre_item = self._pre_item
+
+        _detailed = {'late': None, 'written': False}
+
+        def _process_late_ratings(_details):
+            with self._ratings_lock:
+                if _pre_item != self.cur_item:
+                    return
+                if not _detailed['written']:  # Initial write hasn't happened yet so let it use late ratings instead
+                    _detailed['late'] = _details
+                    return
+                self.set_iter_properties(_details.get('infoproperties', {}), SETPROP_RATINGS)
+
         # Process ratings in a thread
         def _process_ratings():
             get_property('IsUpdatingRatings', 'True')
-            _details = _item.get_all_ratings() or {}
-            self.clear_property_list(SETPROP_RATINGS)
-            self.set_iter_properties(_details.get('infoproperties', {}), SETPROP_RATINGS) if self.is_same_item() else None
+            _details = _item.get_all_ratings(on_late=_process_late_ratings) or {}
+            with self._ratings_lock:
+                _details = _detailed['late'] or _details
+                self.clear_property_list(SETPROP_RATINGS)
+                self.set_iter_properties(_details.get('infoproperties', {}), SETPROP_RATINGS) if self.is_same_item() else None
+                _detailed['written'] = True
             get_property('IsUpdatingRatings', clear_property=True)
 
         if process_ratings:
@@ -293,8 +322,7 @@ class ListItemMonitor(CommonMonitorFunctions):
         ignore_keys = prev_properties.intersection(self.properties)
         ignore_keys.update(SETPROP_RATINGS)
         ignore_keys.update(SETMAIN_ARTWORK)
-        for k in prev_properties - ignore_keys:
-            self.clear_property(k)
+        self.clear_property_list(prev_properties - ignore_keys)
 
     def on_finalise(self):
         func = self.on_finalise_listcontainer if self._listcontainer else self.on_finalise_winproperties
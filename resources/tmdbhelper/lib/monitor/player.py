@@ -29,6 +29,10 @@ class PlayerMonitor(Player, CommonMonitorFunctions):
         self.reset_properties()
         self.set_trakt_properties()
 
+    def clear_properties(self, ignore_keys=None):
+        self.reset_property_state({'CropImage', 'CropImage.Original'})  # Set by image manipulations not monitor
+        super().clear_properties(ignore_keys=ignore_keys)
+
     def reset_properties(self):
         self.clear_properties()
         self.properties = set()
@@ -5,6 +5,7 @@ from tmdbhelper.lib.monitor.cronjob import CronJobMonitor
 from tmdbhelper.lib.monitor.listitem import ListItemMonitor
 from tmdbhelper.lib.monitor.player import PlayerMonitor
 from tmdbhelper.lib.monitor.update import UpdateMonitor
+from tmdbhelper.lib.files.bcache import flush_write_queues
 from threading import Thread
 
 
@@ -69,6 +70,7 @@ class ServiceMonitor(object):
         self.xbmc_monitor.waitForAbort(1)
 
     def _on_exit(self):
+        flush_write_queues(final=True)  # Commit any pending cache writes before exiting even if aborting
         if not self.xbmc_monitor.abortRequested():
             self.listitem_monitor.clear_properties()
             get_property('ServiceStarted', clear_property=True)
@@ -7,7 +7,7 @@ from tmdbhelper.lib.addon.consts import PLAYERS_BASEDIR_SAVE, PLAYERS_PRIORITY
 from tmdbhelper.lib.files.futils import dumps_to_file, delete_file
 from tmdbhelper.lib.items.listitem import ListItem
 from tmdbhelper.lib.player.create import CreatePlayer
-from tmdbhelper.lib.player.putils import get_players_from_file
+from tmdbhelper.lib.player.putils import get_players_from_file, clear_players_index
 from tmdbhelper.lib.player.editsteps import _EditPlayer
 from json import dumps
 from copy import deepcopy
@@ -209,6 +209,7 @@ class ConfigurePlayers():
             return
         with BusyDialog():
             delete_file(PLAYERS_BASEDIR_SAVE, filename, join_addon_data=False)
+            clear_players_index()
             self.get_players()
 
     def save_player(self, player, filename, confirm=True):
@@ -220,6 +221,7 @@ class ConfigurePlayers():
             self.players[filename] = player  # Update our players dictionary
             self.dialog_players = self._get_dialog_players(self.players)  # Update our dialog list
             dumps_to_file(player, PLAYERS_BASEDIR_SAVE, filename, indent=4, join_addon_data=False)  # Write out file
+            clear_players_index()  # Overwriting file might not change folder modified time
         return filename
 
     def run(self):
@@ -5,6 +5,7 @@ from tmdbhelper.lib.files.futils import get_files_in_folder, read_file, write_to
 from tmdbhelper.lib.api.kodi.rpc import get_directory
 from tmdbhelper.lib.items.listitem import ListItem
 from tmdbhelper.lib.addon.dialog import BusyDialog
+from tmdbhelper.lib.player.putils import clear_players_index
 
 
 class CreatePlayer():
@@ -79,6 +80,7 @@ class CreatePlayer():
     def save_player(self):
         filename = f'autogen.{self.plugin_id}.json'
         write_to_file(self.template, PLAYERS_BASEDIR_SAVE, filename, join_addon_data=False)
+        clear_players_index()  # Players index key is only checked once per session so make sure new player is read
         return filename
 
     def get_search_urls(self):
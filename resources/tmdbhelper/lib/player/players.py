@@ -10,7 +10,7 @@ from tmdbhelper.lib.items.listitem import ListItem
 from tmdbhelper.lib.api.kodi.rpc import get_directory, KodiLibrary
 from tmdbhelper.lib.player.inputter import KeyboardInputter
 from tmdbhelper.lib.addon.logger import kodi_log
-from threading import Thread
+from threading import Thread, Event
 
 
 class PlayerHacks():
@@ -446,6 +446,7 @@ class PlayerProperties():
 class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
 
     TMDB_TYPE_CONVERSION = {'season': 'tv', 'episode': 'tv'}
+    _is_speculative = False  # Set on copies used to resolve fallback players ahead of time
 
     def __init__(self, tmdb_type, tmdb_id=None, season=None, episode=None, ignore_default='', islocal=False, player=None, mode=None, **kwargs):
 
@@ -474,6 +475,10 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         self.is_strm = islocal
         self.current_player = {}
 
+        self.speculative_players = get_setting('speculative_players', 'int')  # Number of fallback players to resolve ahead
+        self._speculative = {}
+        self._speculative_event = Event()
+
     def select_player(self, detailed=True, clear_player=False, header=get_localized(32042), combined=False):
         """ Returns user selected player via dialog - detailed bool switches dialog style """
         def _select_standard(players_list=None):
@@ -553,15 +558,111 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         if player.get('fallback'):
             return self._get_player_or_fallback(player['fallback'])
 
+    @staticmethod
+    def _get_speculative_key(player):
+        return (player.get('file'), player.get('mode'))
+
+    def _is_speculative_player(self, player, requires_ids=False):
+        """ Only players which walk folders without keyboard or dialog steps using current details can be resolved ahead """
+        if not isinstance(player.get('actions'), list):
+            return False
+        if player.get('requires_ids') and not requires_ids:
+            return False  # Don't wait for external ids for a player that might not be needed
+        if player.get('api_language', None) != self.api_language or player.get('language'):
+            return False
+        for action in player['actions'][1:]:
+            if action.get('keyboard') or action.get('dialog'):
+                return False
+        return True
+
+    def _get_speculative_chain(self, player):
+        """ Returns the fallback players of player up to the number of fallback players to resolve ahead """
+        chain = []
+        fallback = player.get('fallback')
+        while fallback and len(chain) < self.speculative_players:
+            fallback_player = self._get_player_or_fallback(fallback)
+            if not fallback_player or fallback_player in chain:
+                break
+            chain.append(fallback_player)
+            fallback = fallback_player.get('fallback')
+        return chain
+
+    def _start_speculative_players(self, player):
+        """ Start resolving fallback players of player in background threads in case player fails """
+        if self._is_speculative or self.speculative_players < 1:
+            return
+
+        def _get_speculative_path(players, player):
+            try:
+                players.speculative_path = players._get_path_from_player(player)
+            except Exception as exc:  # Treat as failed player so that main thread moves on to next fallback
+                kodi_log(f'lib.player.players speculative player {player.get("name")}: {exc}', 1)
+                players.speculative_path = None
+
+        from copy import copy, deepcopy
+        for fallback_player in self._get_speculative_chain(player):
+            key = self._get_speculative_key(fallback_player)
+            if key in self._speculative:
+                continue
+            if not self._is_speculative_player(fallback_player, requires_ids=player.get('requires_ids')):
+                continue
+            players = copy(self)
+            players._is_speculative = True
+            players.speculative_path = None
+            players.action_log = []
+            players.item = deepcopy(self.item)  # Shallow copy shares item dict which is updated while resolving
+            fallback_player = dict(fallback_player, actions=deepcopy(fallback_player['actions']))  # Actions are modified while walking
+            thread = Thread(target=_get_speculative_path, args=(players, fallback_player), daemon=True)
+            thread.start()
+            self._speculative[key] = (thread, players)
+
+    def _get_speculative_path(self, player):
+        """ Returns tuple containing path of player resolved ahead or None if it wasn't started """
+        try:
+            thread, players = self._speculative.pop(self._get_speculative_key(player))
+        except KeyError:
+            return
+        thread.join()
+        self.action_log += players.action_log
+        return (players.speculative_path, )
+
+    def _stop_speculative_players(self):
+        """ Stop remaining players resolving ahead at their next step """
+        self._speculative_event.set()
+        self._speculative_event = Event()  # Copies already started keep the set event but later copies can resolve again
+        self._speculative = {}
+
+    def _get_compiled_rules(self, action):
+        """
+        Returns function to get formatted and precompiled rule for action key
+        Rules are compiled on first use so that formatting errors are raised at the same point as before
+        """
+        _rules = {}
+
+        def _get_compiled_rule(k):
+            try:
+                return _rules[k]
+            except KeyError:
+                pass
+            if k == 'position':
+                _rules[k] = try_int(self.string_format_map(action[k]))
+                return _rules[k]
+            str_fmt_map = self.string_format_map(action[k])
+            _rules[k] = (str_fmt_map, re.compile(str_fmt_map))
+            return _rules[k]
+
+        return _get_compiled_rule
+
     def _get_path_from_rules(self, folder, action, strict=False):
         """ Returns tuple of (path, is_folder) """
         _matches = []
         _action_log = []
+        _get_compiled_rule = self._get_compiled_rules(action)
         for x, f in enumerate(folder):
             _lastaction = ['   Itm: ', f.get('label'), '\n']
-            for k, v in action.items():  # Iterate through our key (infolabel) / value (infolabel must match) pairs of our action
+            for k in action:  # Iterate through our key (infolabel) / value (infolabel must match) pairs of our action
                 if k == 'position':  # We're looking for an item position not an infolabel
-                    if try_int(self.string_format_map(v)) != x + 1:  # Format our position value and add one since people are dumb and don't know that arrays start at 0
+                    if _get_compiled_rule(k) != x + 1:  # Format our position value and add one since people are dumb and don't know that arrays start at 0
                         break  # Not the item position we want so let's go to next item in folder
                     continue  # Continue to check other actions in step
                 itm_key_val = f'{f.get(k, "")}'  # Wrangle to string
@@ -569,9 +670,9 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
                 if not itm_key_val:
                     _action_log += _lastaction
                     break  # Item doesn't have key so go to next item
-                str_fmt_map = self.string_format_map(v)
+                str_fmt_map, str_fmt_regex = _get_compiled_rule(k)
                 _lastaction += ('   Fmt: ', str_fmt_map, '\n')
-                if not re.match(str_fmt_map, itm_key_val):  # Format our value and check if it regex matches the infolabel key
+                if not str_fmt_regex.match(itm_key_val):  # Format our value and check if it regex matches the infolabel key
                     _action_log += _lastaction
                     break  # Item's key value doesn't match value we are looking for so let's got to next item in folder
             else:  # Item matched our criteria so let's return it
@@ -664,6 +765,10 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         if not is_folder:
             return path
         for action in actions[1:]:
+            # Stop resolving ahead if a previous player succeeded
+            if self._is_speculative and self._speculative_event.is_set():
+                return
+
             # Start thread with keyboard inputter if needed
             if action.get('keyboard'):
                 if action['keyboard'] in ['Up', 'Down', 'Left', 'Right', 'Select']:
@@ -813,7 +918,10 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
         # Allow for a separate translation language to add "{de_title}" keys ("de" is iso language code)
         self.get_language_details(player['language'], self.item.get('year')) if player.get('language') else None
 
-        path = self._get_path_from_player(player)
+        # Resolve fallback players concurrently if enabled and use their path if already resolved ahead
+        self._start_speculative_players(player)
+        speculative_path = self._get_speculative_path(player)
+        path = speculative_path[0] if speculative_path else self._get_path_from_player(player)
         if not path:
             self.action_log += ('FAILURE!', '\n')
             if player.get('idx') is not None:
@@ -821,6 +929,7 @@ class Players(PlayerProperties, PlayerDetails, PlayerMethods, PlayerHacks):
             fallback = self._get_player_or_fallback(player['fallback']) if player.get('fallback') else None
             return self._get_resolved_path(fallback)
         if path and isinstance(path, tuple):
+            self._stop_speculative_players()
             self.action_log += ('SUCCESS!', '\n')
             return {
                 'url': path[0],
@@ -20,38 +20,115 @@ def make_upnext(current_episode, next_episode):
     AddonSignals.sendSignal('upnext_data', next_info, source_id='plugin.video.themoviedb.helper')
 
 
-def get_players_from_file():
-    from json import loads
-    from tmdbhelper.lib.files.futils import get_files_in_folder, read_file
-    from tmdbhelper.lib.addon.plugin import get_setting, get_condvisibility
-    from tmdbhelper.lib.addon.consts import PLAYERS_BASEDIR_BUNDLED, PLAYERS_BASEDIR_USER, PLAYERS_BASEDIR_SAVE, PLAYERS_REQUIRED_IDS
-    from tmdbhelper.lib.addon.thread import ParallelThread
+PLAYERS_INDEX_CACHE_NAME = 'players_index'
+PLAYERS_INDEX_PROPERTY = 'PlayersIndexKey'
+PLAYERS_INDEX_VERSION = 2
+
 
+def get_enabled_addons():
+    """ Get set of enabled addon ids in one JSON-RPC request. Returns None if request failed """
+    from tmdbhelper.lib.api.kodi.rpc import get_jsonrpc
+    try:
+        response = get_jsonrpc('Addons.GetAddons', {'enabled': True})['result']['addons'] or []
+    except (KeyError, AttributeError, TypeError):
+        return
+    return {i.get('addonid') for i in response}
+
+
+def get_players_basedirs():
+    from tmdbhelper.lib.addon.plugin import get_setting
+    from tmdbhelper.lib.addon.consts import PLAYERS_BASEDIR_BUNDLED, PLAYERS_BASEDIR_USER, PLAYERS_BASEDIR_SAVE
     basedirs = [PLAYERS_BASEDIR_USER]
     if get_setting('bundled_players'):
         basedirs += [PLAYERS_BASEDIR_BUNDLED]
     basedirs += [PLAYERS_BASEDIR_SAVE]  # Add saved players last so they overwrite
+    return basedirs
+
+
+def get_players_index_key(basedirs):
+    """ Index is only valid while addon version and the name and modified time of every player file is unchanged
+    Player files are checked rather than folders because files edited or overwritten in place don't change folder
+    Key is stored in a window property so that player files are only checked once per Kodi session
+    """
+    from json import loads, dumps
+    from jurialmunkey.window import get_property
+    from tmdbhelper.lib.addon.plugin import ADDON
+    from tmdbhelper.lib.files.futils import get_modified_time, get_files_in_folder
+    try:
+        index_key = loads(get_property(PLAYERS_INDEX_PROPERTY) or 'null')
+    except ValueError:
+        index_key = None
+    version = [PLAYERS_INDEX_VERSION, ADDON.getAddonInfo('version')]
+    if index_key and index_key[:2] == version and [i[0] for i in index_key[2:]] == basedirs:
+        return index_key
+    index_key = version + [
+        [i, [[j, get_modified_time(i + j)] for j in sorted(get_files_in_folder(i, r'.*\.json'))]]
+        for i in basedirs]
+    get_property(PLAYERS_INDEX_PROPERTY, set_property=dumps(index_key))
+    return index_key
+
+
+def clear_players_index():
+    """ Delete players index so that player files are read again on next play """
+    from jurialmunkey.window import get_property
+    from tmdbhelper.lib.files.futils import delete_file, get_filecache_name
+    get_property(PLAYERS_INDEX_PROPERTY, clear_property=True)
+    delete_file('pickle', get_filecache_name(PLAYERS_INDEX_CACHE_NAME))
+
+
+def get_players_index(basedirs):
+    """
+    Get list of [basedir, {file: {'plugins': [plugin], 'meta': meta}}] for all player files
+    Parsed players are stored in addon_data and only read from files again when index key changes
+    """
+    from json import loads
+    from tmdbhelper.lib.files.futils import get_files_in_folder, read_file, get_json_filecache, set_json_filecache
+    from tmdbhelper.lib.addon.consts import PLAYERS_REQUIRED_IDS
+    from tmdbhelper.lib.addon.thread import ParallelThread
+
+    index_key = get_players_index_key(basedirs)
+    index = get_json_filecache(PLAYERS_INDEX_CACHE_NAME) or {}
+    if index.get('key') == index_key:
+        return index['players']
 
     def _threaditem(file):
         data = read_file(basedir + file)
         meta = loads(data) or {}
         plugins = meta.get('plugin') or 'plugin.undefined'  # Give dummy name to undefined plugins so that they fail the check
         plugins = plugins if isinstance(plugins, list) else [plugins]  # Listify for simplicity of code
-        for i in plugins:
-            if not get_condvisibility(f'System.AddonIsEnabled({i})'):
-                return (None, None, )  # System doesn't have a required plugin so skip this player
-        else:
-            for _id in PLAYERS_REQUIRED_IDS:
-                if _id in data:
-                    meta['requires_ids'] = True
-                    break
-            meta['plugin'] = plugins[0]
-            return (file, meta,)
+        for _id in PLAYERS_REQUIRED_IDS:
+            if _id in data:
+                meta['requires_ids'] = True
+                break
+        return (file, {'plugins': plugins, 'meta': meta},)
 
-    players = {}
+    players = []
     for basedir in basedirs:
         files = get_files_in_folder(basedir, r'.*\.json')
         with ParallelThread(files, _threaditem) as pt:
             item_queue = pt.queue
-        players.update({k: v for k, v in item_queue if k and v})
+        players.append([basedir, {k: v for k, v in item_queue if k and v}])
+
+    set_json_filecache({'key': index_key, 'players': players}, PLAYERS_INDEX_CACHE_NAME, cache_days=0)
+    return players
+
+
+def get_players_from_file():
+    from tmdbhelper.lib.addon.plugin import get_condvisibility
+
+    enabled_addons = get_enabled_addons()
+
+    def _is_enabled(plugin):
+        if enabled_addons is not None:
+            return plugin in enabled_addons  # JSON-RPC lists every enabled addon so missing plugins aren't installed
+        return get_condvisibility(f'System.AddonIsEnabled({plugin})')  # Fallback to checking each plugin if request failed
+
+    players = {}
+    for _, basedir_players in get_players_index(get_players_basedirs()):
+        for file, player in basedir_players.items():
+            if not all(_is_enabled(i) for i in player['plugins']):
+                continue  # System doesn't have a required plugin so skip this player
+            meta = player['meta']
+            meta['plugin'] = player['plugins'][0]
+            players[file] = meta
     return players
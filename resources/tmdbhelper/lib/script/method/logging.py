@@ -49,3 +49,23 @@ def log_sync(log_sync, trakt_type='show', id_type=None, extended=None, **kwargs)
         filename = validify_filename(f'sync__{log_sync}_{trakt_type}_{id_type}_{extended}.json')
         dumps_to_file(data, 'log_request', filename)
         Dialog().textviewer(filename, dumps(data, indent=2))
+
+
+def cache_stats(cache_stats=None, **kwargs):
+    """ Show table of cache hits, misses and time spent for each cache since Kodi started. Use cache_stats=reset to clear """
+    from xbmcgui import Dialog
+    from tmdbhelper.lib.files.cstats import CacheStats
+    if cache_stats == 'reset':
+        CacheStats.clear_saved_stats()
+        return
+    stats = CacheStats.get_saved_stats()
+    Dialog().textviewer('Cache Stats', CacheStats.get_table(stats) or 'No cache stats recorded')
+
+
+def timer_trace_report(timer_trace_report=None, **kwargs):
+    """ Show p50 and p95 directory build times by route from timer traces. Use timer_trace_report=bucket for other timers """
+    from xbmcgui import Dialog
+    from tmdbhelper.lib.addon.timertrace import get_timer_trace_folder, get_timer_trace_files, read_timer_traces, get_timer_trace_report
+    bucket = timer_trace_report if timer_trace_report and timer_trace_report != 'true' else 'total'
+    traces = read_timer_traces(get_timer_trace_files(get_timer_trace_folder()))
+    Dialog().textviewer(f'Timer Traces ({bucket})', get_timer_trace_report(traces, bucket) or 'No timer traces recorded')
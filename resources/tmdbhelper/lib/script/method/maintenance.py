@@ -17,6 +17,33 @@ def clean_old_databases():
         delete_folder(f'{save_path}{f}/', force=True, check_exists=True, join_addon_data=False)
 
 
+def clean_file_memcache():
+    """ Clear file memory cache on startup so that it is reset with Kodi like window property memory cache """
+    from tmdbhelper.lib.files.futils import delete_folder
+    from tmdbhelper.lib.files.mcache import FILE_MEMCACHE_FOLDER
+    delete_folder(FILE_MEMCACHE_FOLDER, force=True, check_exists=True)
+
+
+def image_cache_report():
+    """ Show number of images and size of each manipulated image folder """
+    from xbmcgui import Dialog
+    from tmdbhelper.lib.addon.dialog import BusyDialog
+    from tmdbhelper.lib.addon.plugin import get_setting
+    from tmdbhelper.lib.files.futils import normalise_filesize
+    from tmdbhelper.lib.files.icache import ImageCache
+    with BusyDialog():
+        image_cache = ImageCache()
+        image_cache.scan()
+        usage = image_cache.get_usage()
+        image_cache.close()
+    max_megabytes = get_setting('image_cache_size', 'int')
+    lines = [f'{folder:<16} {count:>8} {normalise_filesize(size):>12}' for folder, count, size in usage]
+    lines.append('')
+    lines.append(f'{"Total":<16} {sum(i[1] for i in usage):>8} {normalise_filesize(sum(i[2] for i in usage)):>12}')
+    lines.append(f'{"Limit":<16} {"":>8} {f"{max_megabytes} MB" if max_megabytes else "None":>12}')
+    Dialog().textviewer('Image Cache', '\n'.join(lines))
+
+
 def recache_kodidb(notification=True):
     from tmdbhelper.lib.addon.plugin import ADDONPATH
     from tmdbhelper.lib.api.kodi.rpc import KodiLibrary
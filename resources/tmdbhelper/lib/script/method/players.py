@@ -72,6 +72,9 @@ def update_players():
         download_url=players_url)
     downloader.get_extracted_zip()
 
+    from tmdbhelper.lib.player.putils import clear_players_index
+    clear_players_index()  # Extracted files replace existing files so make sure players are read again
+
 
 def set_defaultplayer(**kwargs):
     from tmdbhelper.lib.player.players import Players
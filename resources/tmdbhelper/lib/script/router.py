@@ -129,10 +129,16 @@ class Script(object):
             lambda **kwargs: importmodule('tmdbhelper.lib.script.method.logging', 'log_request')(**kwargs),
         'log_sync':
             lambda **kwargs: importmodule('tmdbhelper.lib.script.method.logging', 'log_sync')(**kwargs),
+        'cache_stats':
+            lambda **kwargs: importmodule('tmdbhelper.lib.script.method.logging', 'cache_stats')(**kwargs),
+        'timer_trace_report':
+            lambda **kwargs: importmodule('tmdbhelper.lib.script.method.logging', 'timer_trace_report')(**kwargs),
         'delete_cache':
             lambda **kwargs: importmodule('tmdbhelper.lib.script.method.maintenance', 'delete_cache')(**kwargs),
         'recache_kodidb':
             lambda **kwargs: importmodule('tmdbhelper.lib.script.method.maintenance', 'recache_kodidb')(),
+        'image_cache_report':
+            lambda **kwargs: importmodule('tmdbhelper.lib.script.method.maintenance', 'image_cache_report')(),
         'build_awards':
             lambda **kwargs: importmodule('tmdbhelper.lib.script.method.build_awards', 'build_awards')(**kwargs),
         'restart_service':
@@ -4,14 +4,20 @@ from xbmcgui import DialogProgressBG
 from tmdbhelper.lib.addon.plugin import get_setting, get_localized, set_setting
 from jurialmunkey.parser import try_int
 from tmdbhelper.lib.addon.tmdate import is_unaired_timestamp, get_current_date_time
-from tmdbhelper.lib.files.futils import validify_filename, get_tmdb_id_nfo
+from tmdbhelper.lib.files.futils import validify_filename, get_json_filecache, set_json_filecache, delete_file, get_filecache_name
+from tmdbhelper.lib.addon.thread import ParallelThread
 from tmdbhelper.lib.update.logger import _LibraryLogger
-from tmdbhelper.lib.update.update import BASEDIR_MOVIE, BASEDIR_TV, STRM_MOVIE, STRM_EPISODE, create_file, create_nfo, get_unique_folder
+from tmdbhelper.lib.update.update import BASEDIR_MOVIE, BASEDIR_TV, STRM_MOVIE, STRM_EPISODE, create_file, create_files, get_file_item, create_nfo, get_unique_folder, get_nfo_index
 from tmdbhelper.lib.update.cacher import _TVShowCache
 from tmdbhelper.lib.update.common import LibraryCommonFunctions
 from tmdbhelper.lib.api.tmdb.api import TMDb
 
 
+UPDATE_CHUNK_SIZE = 20  # Number of shows fetched concurrently before writing files and saving checkpoint
+UPDATE_CHECKPOINT = 'library_autoupdate_checkpoint'
+UPDATE_CHECKPOINT_DAYS = 0.5  # Only resume interrupted runs from the same day
+
+
 def add_to_library(info, busy_spinner=True, library_adder=None, finished=True, **kwargs):
     if not info:
         return
@@ -49,14 +55,12 @@ class LibraryAdder(LibraryCommonFunctions):
         self.clean_library = False
         self._msg_start = get_localized(32166)
         self._msg_title = 'TMDbHelper Library'
+        self._file_queue = None  # Strm files waiting to be written when update is pipelined
+        self._cache_queue = None  # Show caches waiting to be saved after their strm files are written
 
-    def get_tv_folder_nfos(self):
-        nfos = []
-        nfos_append = nfos.append  # For speed since we can't do a list comp easily here
-        for f in xbmcvfs.listdir(BASEDIR_TV)[0]:
-            tmdb_id = get_tmdb_id_nfo(BASEDIR_TV, f)
-            nfos_append({'tmdb_id': tmdb_id, 'folder': f}) if tmdb_id else None
-        return nfos
+    def get_tv_folder_nfos(self, refresh=False):
+        nfo_index = get_nfo_index(BASEDIR_TV, refresh=refresh)
+        return [{'tmdb_id': tmdb_id, 'folder': f} for f, tmdb_id in nfo_index.items() if tmdb_id]
 
     def _legacy_conversion(self, folder, tmdb_id):
         # Get details
@@ -86,6 +90,9 @@ class LibraryAdder(LibraryCommonFunctions):
             self._update(x, nfos_total, message=f'{get_localized(32167)} {folder}...')
             self._legacy_conversion(folder, tmdb_id)
 
+        # Folders renamed so rescan index
+        self.get_tv_folder_nfos(refresh=True)
+
         # Mark as complete and set to clean library
         set_setting('legacy_conversion', True)
         self.clean_library = True
@@ -93,15 +100,75 @@ class LibraryAdder(LibraryCommonFunctions):
     def update_tvshows(self, force=False, **kwargs):
         nfos = self.get_tv_folder_nfos()
 
-        # Update each show in folder
+        # Skip shows already updated by an interrupted run unless forcing update of all shows
+        checkpoint = [] if force else (get_json_filecache(UPDATE_CHECKPOINT) or [])
+        if checkpoint:
+            completed = set(checkpoint)
+            nfos = [i for i in nfos if i['tmdb_id'] not in completed]
+
+        # Update shows in chunks: fetch details concurrently then add and write files before saving checkpoint
         nfos_total = len(nfos)
-        for x, i in enumerate(nfos):
-            self._update(x, nfos_total, message=f'{get_localized(32167)} {i["folder"]}...')
-            self.add_tvshow(tmdb_id=i['tmdb_id'], force=force)
+        for x in range(0, nfos_total, UPDATE_CHUNK_SIZE):
+            chunk = nfos[x:x + UPDATE_CHUNK_SIZE]
+            self._update_tvshows_chunk(chunk, force=force, count=x, total=nfos_total)
+            checkpoint += [i['tmdb_id'] for i in chunk]
+            set_json_filecache(checkpoint, UPDATE_CHECKPOINT, cache_days=UPDATE_CHECKPOINT_DAYS)
+
+        # Run complete so clear checkpoint
+        delete_file('pickle', get_filecache_name(UPDATE_CHECKPOINT))
 
         # Update last updated stamp
         set_setting('last_autoupdate', f'Last updated {get_current_date_time()}', 'str')
 
+    def _update_tvshows_chunk(self, nfos, force=False, count=0, total=0):
+        """ Pipeline for updating a chunk of shows
+        1. Fetch TMDb show details then season details concurrently
+        2. Add shows serially queueing strm files
+        3. Write strm files in one batch then save show caches
+        """
+        def _get_tvshow(i):
+            tv = _TVShow(i['tmdb_id'], force)
+            tv.prefetch_details()
+            return tv
+
+        def _get_season(i):
+            tv, season = i
+            tv.prefetch_episodes(season)
+
+        self._update(count, total, message=f'{get_localized(32167)} {nfos[0]["folder"]}...')
+        with ParallelThread(nfos, _get_tvshow) as pt:
+            tvshows = pt.queue
+
+        seasons = [(tv, season) for tv in tvshows if tv for season in tv.get_prefetch_seasons()]
+        with ParallelThread(seasons, _get_season):
+            pass
+
+        self._file_queue, self._cache_queue = [], []
+        try:
+            for x, (i, tv) in enumerate(zip(nfos, tvshows)):
+                self._update(count + x, total, message=f'{get_localized(32167)} {i["folder"]}...')
+                self.add_tvshow(tmdb_id=i['tmdb_id'], force=force, tv=tv)
+        finally:
+            self._flush_file_queue()
+
+    def _flush_file_queue(self):
+        """ Write queued strm files in one batch then save caches of shows whose files are now written """
+        file_queue, self._file_queue = self._file_queue or [], None
+        cache_queue, self._cache_queue = self._cache_queue or [], None
+        items, items_log = [], {}
+        for content, filename, args, kwargs, log_kwargs in file_queue:
+            item = get_file_item(content, filename, *args, **kwargs)
+            if not item:
+                continue
+            items.append(item)
+            items_log[f'{item[0]}{item[1]}'] = log_kwargs
+        results = create_files(items)
+        for status, log_msg in (('added', 'added strm file'), ('unchanged', 'strm file unchanged'), ('failed', 'failed to write strm file')):
+            for file in results[status]:
+                self._log._add(**items_log[file], log_msg=log_msg, path=file)
+        for cache in cache_queue:
+            cache.set_cache()
+
     def add_movie(self, tmdb_id=None, **kwargs):
         if not tmdb_id:
             return
@@ -125,8 +192,8 @@ class LibraryAdder(LibraryCommonFunctions):
         # Return our playlist rule
         return ('filename', file.replace('\\', '/').split('/')[-1])
 
-    def add_tvshow(self, tmdb_id=None, force=False, **kwargs):
-        self.tv = _TVShow(tmdb_id, force)
+    def add_tvshow(self, tmdb_id=None, force=False, tv=None, **kwargs):
+        self.tv = tv or _TVShow(tmdb_id, force)
 
         # Return playlist rule if we don't need to check show this time
         if self._log._add('tv', tmdb_id, self.tv._cache.get_next_check()):
@@ -147,7 +214,10 @@ class LibraryAdder(LibraryCommonFunctions):
             self._add_season(season)
 
         # Store details about what we did into the cache
-        self.tv._cache.set_cache()
+        if self._cache_queue is not None:
+            self._cache_queue.append(self.tv._cache)  # Pipelined update saves cache after strm files are written
+        else:
+            self.tv._cache.set_cache()
 
         # Return our playlist rule tuple
         return ('title', self.tv.details.get('name'))
@@ -196,6 +266,13 @@ class LibraryAdder(LibraryCommonFunctions):
             self._log._add('tv', self.tv.tmdb_id, 'found in library', season=season, episode=number, path=file)
             return
 
+        # Queue our strm file if update is pipelined
+        if self._file_queue is not None:
+            self._file_queue.append((
+                STRM_EPISODE.format(self.tv.tmdb_id, season, number), filename, (self.tv.name, folder), {'basedir': BASEDIR_TV},
+                {'key': 'tv', 'tmdb_id': self.tv.tmdb_id, 'season': season, 'episode': number}))
+            return
+
         # Add our strm file
         file = create_file(STRM_EPISODE.format(self.tv.tmdb_id, season, number), filename, self.tv.name, folder, basedir=BASEDIR_TV)
         self._log._add('tv', self.tv.tmdb_id, 'added strm file', season=season, episode=number, path=file)
@@ -207,8 +284,27 @@ class _TVShow():
         self.tmdb_id = tmdb_id
         self.details = None
         self.name = None
+        self.season_details_cache = {}
+
+    def prefetch_details(self):
+        """ Get details ahead of adding show unless show is not due to be checked """
+        if self._cache.get_next_check():
+            return
+        return self.get_details()
+
+    def get_prefetch_seasons(self, blacklist=[0]):
+        """ Season numbers which will need episodes fetched when adding show """
+        if not self.details:
+            return []
+        seasons = [i.get('season_number', 0) for i in self.details.get('seasons', [])]
+        return [i for i in seasons if try_int(i) not in blacklist and not self._cache.is_added_season(i)]
+
+    def prefetch_episodes(self, season):
+        self.season_details_cache[season] = TMDb().get_request('tv', self.tmdb_id, 'season', season, cache_refresh=True)
 
     def get_details(self):
+        if self.details:
+            return self.details
         self.details = TMDb().get_request_sc('tv', self.tmdb_id, append_to_response='external_ids')
         if not self.details:
             return
@@ -227,11 +323,25 @@ class _TVShow():
         self.dbid = kodi_db.get_info(info='dbid', imdb_id=self.imdb_id, tmdb_id=self.tmdb_id, tvdb_id=self.tvdb_id)
         return self.dbid
 
+    @property
+    def episode_db(self):
+        """ Map of {(season, episode): item} for episodes of show in Kodi library loaded once per show """
+        try:
+            return self._episode_db
+        except AttributeError:
+            self._episode_db = {}
+            database = rpc.KodiLibrary(dbtype='episode', tvshowid=self.dbid, logging=False).database if self.dbid else None
+            for i in database or []:
+                self._episode_db.setdefault((i.get('season'), i.get('episode')), i)
+            return self._episode_db
+
     def get_episode_db_info(self, season, episode, info='dbid'):
         if not self.dbid:
             return
-        return rpc.KodiLibrary(dbtype='episode', tvshowid=self.dbid, logging=False).get_info(
-            info=info, season=season, episode=episode)
+        try:
+            return self.episode_db[(try_int(season), try_int(episode))].get(info)
+        except KeyError:
+            return
 
     def get_seasons(self):
         self.seasons = self.details.get('seasons', [])
@@ -240,7 +350,10 @@ class _TVShow():
 
     def get_episodes(self, season):
         self.e_total = 0
-        self.season_details = TMDb().get_request('tv', self.tmdb_id, 'season', season, cache_refresh=True)
+        try:
+            self.season_details = self.season_details_cache.pop(season)
+        except KeyError:
+            self.season_details = TMDb().get_request('tv', self.tmdb_id, 'season', season, cache_refresh=True)
         if not self.season_details:
             return []
         self.episodes = [i for i in self.season_details.get('episodes', []) if i.get('episode_number', 0) != 0]
@@ -3,7 +3,8 @@ from xbmcgui import Dialog
 from tmdbhelper.lib.addon.dialog import BusyDialog
 from tmdbhelper.lib.addon.plugin import get_setting, get_localized
 from jurialmunkey.parser import try_int
-from tmdbhelper.lib.files.futils import validify_filename, make_path, write_to_file, get_tmdb_id_nfo
+from tmdbhelper.lib.files.futils import validify_filename, make_path, write_to_file, read_file, get_tmdb_id_nfo, get_modified_time, get_files_in_folder
+from tmdbhelper.lib.files.futils import get_json_filecache, set_json_filecache
 from tmdbhelper.lib.api.trakt.api import TraktAPI
 from tmdbhelper.lib.addon.logger import kodi_log
 
@@ -20,6 +21,7 @@ Please respect the APIs that provide this data for free.
 """
 LIBRARY_ADD_LIMIT_TVSHOWS = 500
 LIBRARY_ADD_LIMIT_MOVIES = 2500
+NFO_INDEX = {}  # In memory copy of {(basedir, tmdb_type): {folder: {'nfo': [[filename, mtime]], 'tmdb_id': tmdb_id}}}
 
 
 def replace_content(content, old, new):
@@ -62,9 +64,9 @@ def check_overlimit(request):
     return totals
 
 
-def create_file(content, filename, *args, **kwargs):
+def get_file_item(content, filename, *args, **kwargs):
     """
-    Create the file and folder structure: filename=.strm file, content= content of file.
+    Validify and build the (path, filename, content) tuple for a file: filename=.strm file, content= content of file.
     *args = folders to create.
     """
 
@@ -84,23 +86,80 @@ def create_file(content, filename, *args, **kwargs):
     if not filename:
         return
 
-    # Check that we can actually make the path
-    if not make_path(path, warn_dialog=True):
-        return
-
-    # Write out our file
     filename = f'{validify_filename(filename)}.{kwargs.get("file_ext", "strm")}'
-    filepath = f'{path}{filename}'
-    write_to_file(content, path, filename, join_addon_data=False)
-    kodi_log(['ADD LIBRARY -- Successfully added:\n', filepath, '\n', content], 2)
-    return filepath
+    return (path, filename, content)
+
+
+def is_unchanged_file(filepath, content):
+    """ Check if file already exists with identical content """
+    try:
+        existing = read_file(filepath)
+    except Exception:
+        return False
+    if not existing:
+        return False
+    return existing == content
+
+
+def create_files(items, warn_dialog=True):
+    """
+    Write a batch of files making each folder once and skipping files where content is unchanged
+    items: list of (path, filename, content) tuples from get_file_item
+    Returns dictionary of {'added': [filepath], 'unchanged': [filepath], 'failed': [filepath]}
+    """
+    results = {'added': [], 'unchanged': [], 'failed': []}
+    made_paths = {}
+
+    for path, filename, content in items:
+        filepath = f'{path}{filename}'
+
+        # Check that we can actually make the path
+        if path not in made_paths:
+            made_paths[path] = make_path(path, warn_dialog=warn_dialog)
+            warn_dialog = warn_dialog and made_paths[path]  # Only warn user once per batch
+        if not made_paths[path]:
+            results['failed'].append(filepath)
+            continue
+
+        # Skip rewriting files that haven't changed so library scanner doesn't check them again
+        if is_unchanged_file(filepath, content):
+            results['unchanged'].append(filepath)
+            continue
+
+        # Write out our file
+        try:
+            write_to_file(content, path, filename, join_addon_data=False)
+        except Exception as exc:
+            kodi_log(['ADD LIBRARY -- Failed to write:\n', filepath, '\n', exc], 2)
+            results['failed'].append(filepath)
+            continue
+        kodi_log(['ADD LIBRARY -- Successfully added:\n', filepath, '\n', content], 2)
+        results['added'].append(filepath)
+
+    if len(items) > 1:
+        kodi_log(f'ADD LIBRARY -- Added {len(results["added"])} Unchanged {len(results["unchanged"])} Failed {len(results["failed"])}', 2)
+    return results
+
+
+def create_file(content, filename, *args, **kwargs):
+    """
+    Create the file and folder structure: filename=.strm file, content= content of file.
+    *args = folders to create.
+    """
+    item = get_file_item(content, filename, *args, **kwargs)
+    if not item:
+        return
+    results = create_files([item])
+    filepaths = results['added'] + results['unchanged']
+    return filepaths[0] if filepaths else None
 
 
 def create_nfo(tmdb_type, tmdb_id, *args, **kwargs):
     filename = NFOFILE_MOVIE if tmdb_type == 'movie' else NFOFILE_TV
     content = f'https://www.themoviedb.org/{tmdb_type}/{tmdb_id}'
     kwargs['file_ext'], kwargs['clean_url'] = 'nfo', False
-    create_file(content, filename, *args, **kwargs)
+    if create_file(content, filename, *args, **kwargs) and args:
+        set_nfo_index_item(kwargs.get('basedir', ''), validify_filename(args[0]), tmdb_id, tmdb_type)
 
 
 def create_playlist(dbtype, user_slug, list_slug):
@@ -117,8 +176,61 @@ def create_playlist(dbtype, user_slug, list_slug):
     create_file(u'\n'.join(fcontent), filename, basedir=filepath, file_ext='xsp', clean_url=False)
 
 
+def get_nfo_signature(basedir, folder):
+    """ Returns sorted list of [filename, mtime] for nfo files in folder
+    Nfo files are checked rather than folder because editing a file in place doesn't change folder modified time
+    """
+    path = f'{basedir}{folder}/'
+    return [[i, get_modified_time(f'{path}{i}')] for i in sorted(get_files_in_folder(path, regex=r".*\.nfo$"))]
+
+
+def get_nfo_index_folder(basedir, folder, tmdb_type='tv', cached=None):
+    """ Returns {'nfo': signature, 'tmdb_id': tmdb_id} for folder only reading nfo files if signature changed """
+    signature = get_nfo_signature(basedir, folder)
+    if cached and cached.get('nfo') == signature:
+        return cached
+    return {'nfo': signature, 'tmdb_id': get_tmdb_id_nfo(basedir, folder, tmdb_type) if signature else None}
+
+
+def get_nfo_index(basedir, tmdb_type='tv', refresh=False):
+    """
+    Get dictionary of {folder: tmdb_id} for folders in basedir
+    Index is persisted in addon_data and nfo files are only read again when their modified time changes
+    Refresh reads all nfo files again
+    """
+    cache_name = f'library_nfo_index.{tmdb_type}.{basedir}'
+    cached_folders = {} if refresh else NFO_INDEX.get((basedir, tmdb_type))
+    if cached_folders is None:
+        cached_folders = (get_json_filecache(cache_name) or {}).get('folders') or {}
+
+    folders = {
+        f: get_nfo_index_folder(basedir, f, tmdb_type, cached=cached_folders.get(f))
+        for f in xbmcvfs.listdir(basedir)[0]}
+    if folders != cached_folders:
+        set_json_filecache({'folders': folders}, cache_name, cache_days=0)
+
+    NFO_INDEX[(basedir, tmdb_type)] = folders
+    return {k: v.get('tmdb_id') for k, v in folders.items()}
+
+
+def get_nfo_tmdb_id(basedir, folder, tmdb_type='tv'):
+    """ Get tmdb_id from nfo in folder checking nfo modified time before using in memory index """
+    if (basedir, tmdb_type) not in NFO_INDEX:
+        return get_nfo_index(basedir, tmdb_type).get(folder)
+    nfo_index = NFO_INDEX[(basedir, tmdb_type)]
+    nfo_index[folder] = get_nfo_index_folder(basedir, folder, tmdb_type, cached=nfo_index.get(folder))
+    return nfo_index[folder].get('tmdb_id')
+
+
+def set_nfo_index_item(basedir, folder, tmdb_id, tmdb_type='tv'):
+    """ Update in memory index with nfo we created so later lookups in same run see it """
+    if (basedir, tmdb_type) not in NFO_INDEX:
+        return
+    NFO_INDEX[(basedir, tmdb_type)][folder] = {'nfo': get_nfo_signature(basedir, folder), 'tmdb_id': f'{tmdb_id}'}
+
+
 def get_unique_folder(name, tmdb_id, basedir):
-    nfo_id = get_tmdb_id_nfo(basedir, name) if name in xbmcvfs.listdir(basedir)[0] else None
+    nfo_id = get_nfo_tmdb_id(basedir, name)
     if nfo_id and try_int(nfo_id) != try_int(tmdb_id):
         name += f' (TMDB {tmdb_id})'
     return name